@@ -1,4 +1,5 @@
 import os
+import sys
 
 from django.core.management import call_command
 from django.core.wsgi import get_wsgi_application
@@ -6,5 +7,4 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 application = get_wsgi_application()
 
-with open('data.json', 'r', encoding='utf-8') as f:
-    call_command('loaddata', f.name)
+call_command('import_data', sys.argv[1] if len(sys.argv) > 1 else 'export')
@@ -0,0 +1,42 @@
+// Turns every <select data-autocomplete-url> into a search box. Only the
+// selected options are rendered server-side; matches are fetched as JSON
+// ({"results": [{"id": 1, "text": "..."}]}) while the user types.
+document.addEventListener("DOMContentLoaded", () => {
+  document.querySelectorAll("select[data-autocomplete-url]").forEach((select) => {
+    const input = document.createElement("input");
+    input.type = "search";
+    input.className = "form-control mb-1";
+    input.placeholder = "Type to search";
+    const results = document.createElement("div");
+    results.className = "list-group mb-2";
+    select.before(input, results);
+
+    let timer;
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(async () => {
+        const url = new URL(select.dataset.autocompleteUrl, window.location.origin);
+        url.searchParams.set("q", input.value);
+        const response = await fetch(url, {headers: {Accept: "application/json"}});
+        const data = await response.json();
+        results.replaceChildren(...data.results.map((result) => {
+          const button = document.createElement("button");
+          button.type = "button";
+          button.className = "list-group-item list-group-item-action";
+          button.textContent = result.text;
+          button.addEventListener("click", () => {
+            let option = select.querySelector(`option[value="${result.id}"]`);
+            if (!option) {
+              option = new Option(result.text, result.id);
+              select.add(option);
+            }
+            option.selected = true;
+            results.replaceChildren();
+            input.value = "";
+          });
+          return button;
+        }));
+      }, 250);
+    });
+  });
+});
@@ -0,0 +1,89 @@
+// Keeps a comment thread live. Deleted comments are dropped as the task's
+// event stream reports them; on the newest page, comments posted after the
+// newest one shown are fetched from the "since" endpoint whenever the stream
+// announces one (or every 10 seconds while the stream is down), and replies
+// are posted without reloading the thread. Each comment fragment carries
+// data-comment-id, and fragments already shown are skipped: the "since"
+// endpoint repeats the comments just before its cursor.
+document.addEventListener("DOMContentLoaded", () => {
+  const thread = document.getElementById("comment-thread");
+  const form = document.getElementById("comment-form");
+  if (!thread) {
+    return;
+  }
+  const heading = thread.firstElementChild;
+  const following = Boolean(thread.dataset.sinceUrl);
+
+  const insert = (html) => {
+    const template = document.createElement("template");
+    template.innerHTML = html;
+    template.content.querySelectorAll("[data-comment-id]").forEach((comment) => {
+      if (!thread.querySelector(`[data-comment-id="${comment.dataset.commentId}"]`)) {
+        heading.after(comment);
+      }
+    });
+  };
+
+  const poll = async () => {
+    if (!following) {
+      return;
+    }
+    const url = new URL(thread.dataset.sinceUrl, window.location.origin);
+    if (thread.dataset.sinceCursor) {
+      url.searchParams.set("cursor", thread.dataset.sinceCursor);
+    }
+    const response = await fetch(url, {headers: {Accept: "application/json"}});
+    if (!response.ok) {
+      return;
+    }
+    const data = await response.json();
+    insert(data.html);
+    thread.dataset.sinceCursor = data.cursor || "";
+    if (data.has_more) {
+      poll();
+    }
+  };
+  let timer = null;
+  const startPolling = () => {
+    if (following && timer === null) {
+      timer = setInterval(poll, 10000);
+    }
+  };
+  const stopPolling = () => {
+    clearInterval(timer);
+    timer = null;
+  };
+
+  if (window.EventSource && thread.dataset.eventsUrl) {
+    const source = new EventSource(thread.dataset.eventsUrl);
+    source.addEventListener("open", () => {
+      stopPolling();
+      // Catch up on anything posted while the stream was down.
+      poll();
+    });
+    source.addEventListener("error", startPolling);
+    source.addEventListener("comment.created", poll);
+    source.addEventListener("reset", poll);
+    source.addEventListener("comment.deleted", (event) => {
+      const {id} = JSON.parse(event.data);
+      thread.querySelector(`[data-comment-id="${id}"]`)?.remove();
+    });
+  } else {
+    startPolling();
+  }
+
+  if (form) {
+    form.addEventListener("submit", async (event) => {
+      event.preventDefault();
+      const response = await fetch(form.action, {
+        method: "POST",
+        body: new FormData(form),
+        headers: {"X-Requested-With": "XMLHttpRequest"},
+      });
+      if (response.status === 201) {
+        insert(await response.text());
+        form.reset();
+      }
+    });
+  }
+});
@@ -0,0 +1,27 @@
+// Keeps the assignee grid and the assign/remove button of a task page current:
+// on each assignees.changed event from the task's event stream the page is
+// fetched again and every [data-live-id] block is swapped for its new copy.
+document.addEventListener("DOMContentLoaded", () => {
+  const page = document.getElementById("task-detail");
+  if (!page || !page.dataset.eventsUrl || !window.EventSource) {
+    return;
+  }
+
+  const refresh = async () => {
+    const response = await fetch(window.location.href);
+    if (!response.ok) {
+      return;
+    }
+    const fresh = new DOMParser().parseFromString(await response.text(), "text/html");
+    page.querySelectorAll("[data-live-id]").forEach((block) => {
+      const replacement = fresh.querySelector(`[data-live-id="${block.dataset.liveId}"]`);
+      if (replacement) {
+        block.replaceWith(replacement);
+      }
+    });
+  };
+
+  const source = new EventSource(page.dataset.eventsUrl);
+  source.addEventListener("assignees.changed", refresh);
+  source.addEventListener("reset", refresh);
+});
@@ -43,6 +43,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "tasks.middleware.ProfilingMiddleware",
+    "tasks.middleware.MetricsMiddleware",
+    "tasks.middleware.SlowQueryMiddleware",
+    "tasks.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
@@ -147,6 +151,80 @@ LOGIN_REDIRECT_URL = "/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads above this many pixels are rejected before any thumbnail decoding.
+AVATAR_MAX_PIXELS = 40_000_000
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
+
+# Per-view SQL budgets enforced by tasks.middleware.QueryBudgetMiddleware.
+# Breaches are logged to "tasks.query_budget"; set QUERY_BUDGET_RAISE=True
+# (e.g. in CI) to turn them into exceptions.
+
+QUERY_BUDGET_DEFAULT = {"queries": 30, "db_time_ms": 500, "duplicates": 5}
+
+QUERY_BUDGETS = {
+    "tasks:task-detail": {"queries": 8, "duplicates": 0},
+    "tasks:worker-detail": {"queries": 6, "duplicates": 0},
+    "tasks:worker-task-history": {"queries": 5, "duplicates": 0},
+    "tasks:task-list": {"queries": 6, "duplicates": 0},
+    "tasks:worker-list": {"queries": 6, "duplicates": 0},
+    "tasks:position-list": {"queries": 6, "duplicates": 0},
+    "tasks:task-type-list": {"queries": 6, "duplicates": 0},
+    "tasks:comment-list": {"queries": 8, "duplicates": 0},
+    "tasks:comment-since": {"queries": 4, "duplicates": 0},
+    "tasks:task-events": {"queries": 3, "duplicates": 0},
+}
+
+QUERY_BUDGET_RAISE = os.environ.get("QUERY_BUDGET_RAISE", "") == "True"
+
+# Process-local by default; set DJANGO_REDIS_URL to share the cache (and the
+# list page generations in tasks.list_cache) between workers.
+if os.environ.get("DJANGO_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["DJANGO_REDIS_URL"],
+        }
+    }
+    LIST_CACHE_ENABLED = True
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+    # Each worker would bump only its own generations and serve the pages
+    # another worker changed from its stale copy.
+    LIST_CACHE_ENABLED = False
+
+LIST_CACHE_TIMEOUT = int(os.environ.get("LIST_CACHE_TIMEOUT", 300))
+
+# Task events (tasks.live) reach only the listeners of the process that
+# published them; point this at a directory shared by the workers of one host
+# to relay them between processes.
+LIVE_EVENTS_SOCKET_DIR = os.environ.get("LIVE_EVENTS_SOCKET_DIR")
+
+# Request metrics (tasks.metrics) are per process unless this names a
+# directory shared by the workers, which each write their counts to; the
+# /metrics/ page then sums them. It is open to INTERNAL_IPS and superusers.
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+# On-demand profiling (tasks.profiling): off unless PROFILING_DIR is set.
+# Requests sending "X-Profile: <PROFILING_TOKEN>" are profiled, and
+# PROFILING_SAMPLE_RATE of all others; the newest PROFILING_KEEP captures are
+# listed for superusers at /admin/profiles/.
+PROFILING_DIR = os.environ.get("PROFILING_DIR")
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+PROFILING_TRACEMALLOC = os.environ.get("PROFILING_TRACEMALLOC", "") == "True"
+PROFILING_KEEP = int(os.environ.get("PROFILING_KEEP", 50))
+
+# Queries slower than this are aggregated into the SlowQuery table by
+# tasks.middleware.SlowQueryMiddleware (see "manage.py slow_queries"). On
+# PostgreSQL, SLOW_QUERY_EXPLAIN_RATE of the slow SELECTs run outside a
+# transaction also get an EXPLAIN (ANALYZE, BUFFERS) plan.
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_RATE", 0))
@@ -3,7 +3,10 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from tasks.admin import profile_urls
+
 urlpatterns = [
+    path("admin/profiles/", include(profile_urls)),
     path("admin/", admin.site.urls),
     path("", include(("tasks.urls", "tasks"), namespace="tasks")),
     path("accounts/", include("django.contrib.auth.urls")),
@@ -1,49 +1,191 @@
+from datetime import timedelta
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from tasks.models import TaskType, Position, Worker, Task
+from django.db.models.functions import Now
+from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+
+from tasks import archive, profiling
+from tasks.list_cache import bump_generation
+from tasks.models import ArchivedTask, TaskType, Position, Worker, Task
+from tasks.pagination import EstimatedCountPaginator
 from django.contrib.auth.models import Group
 
 
+def set_field(queryset, **values):
+    # One UPDATE for the whole selection. update() sends no post_save, so
+    # the list cache is invalidated here instead.
+    count = queryset.update(**values)
+    bump_generation(queryset.model)
+    opts = queryset.model._meta
+    return f"{count} {opts.verbose_name if count == 1 else opts.verbose_name_plural}"
+
+
+class DeadlineFilter(admin.SimpleListFilter):
+    """Fixed deadline ranges; each is one range scan on the deadline indexes."""
+
+    title = "deadline"
+    parameter_name = "deadline"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("overdue", "Overdue"),
+            ("week", "Due in the next 7 days"),
+            ("month", "Due in the next 30 days"),
+            ("later", "Due later"),
+        )
+
+    def queryset(self, request, queryset):
+        now = timezone.now()
+        if self.value() == "overdue":
+            return queryset.filter(deadline__lt=now, is_completed=False)
+        if self.value() == "week":
+            return queryset.filter(deadline__range=(now, now + timedelta(days=7)))
+        if self.value() == "month":
+            return queryset.filter(deadline__range=(now, now + timedelta(days=30)))
+        if self.value() == "later":
+            return queryset.filter(deadline__gt=now + timedelta(days=30))
+        return queryset
+
+
 @admin.register(Worker)
 class WorkerAdmin(UserAdmin):
     fieldsets = UserAdmin.fieldsets + ((None, {"fields": ("position",)}),)
     add_fieldsets = UserAdmin.add_fieldsets + ((None, {"fields": ("position",)}),)
     list_display = UserAdmin.list_display + ("position",)
-    search_fields = (
-        "username",
-        "position",
-    )
+    list_select_related = ("position",)
+    # Only username has a trigram index (migration 0009).
+    search_fields = ("username",)
     list_filter = (
-        "username",
-        "last_name",
+        "is_staff",
+        "is_active",
         "position",
     )
+    autocomplete_fields = ("position",)
     list_per_page = 20
+    show_full_result_count = False
+    actions = ("activate", "deactivate")
+
+    @admin.action(description="Activate selected workers")
+    def activate(self, request, queryset):
+        self.message_user(request, f"Activated {set_field(queryset, is_active=True)}.")
+
+    @admin.action(description="Deactivate selected workers")
+    def deactivate(self, request, queryset):
+        self.message_user(
+            request, f"Deactivated {set_field(queryset, is_active=False)}."
+        )
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
     list_display = (
         "name",
         "deadline",
         "is_completed",
+        "priority",
         "task_type",
     )
-    search_fields = (
-        "name",
-        "deadline",
-        "task_type",
-    )
+    list_select_related = ("task_type",)
+    # Matches task_name_deadline_idx, so the changelist never sorts.
+    ordering = ("name", "-deadline", "id")
+    search_fields = ("name",)
     list_filter = (
-        "name",
-        "deadline",
+        DeadlineFilter,
         "is_completed",
+        "priority",
         "task_type",
     )
+    autocomplete_fields = ("task_type", "assignees")
+    show_full_result_count = False
+    actions = ("mark_completed", "mark_open")
+
+    @admin.action(description="Mark selected tasks as completed")
+    def mark_completed(self, request, queryset):
+        changed = set_field(
+            queryset.filter(is_completed=False), is_completed=True, completed_at=Now()
+        )
+        self.message_user(request, f"Completed {changed}.")
+
+    @admin.action(description="Mark selected tasks as open")
+    def mark_open(self, request, queryset):
+        changed = set_field(queryset, is_completed=False, completed_at=None)
+        self.message_user(request, f"Reopened {changed}.")
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "deadline", "completed_at", "archived_at", "task_type")
+    list_select_related = ("task_type",)
+    ordering = ("name", "-deadline", "id")
+    search_fields = ("name",)
+    show_full_result_count = False
+    actions = ("restore_tasks",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Restore selected tasks")
+    def restore_tasks(self, request, queryset):
+        total = sum(archive.restore(queryset.order_by()), archive.Moved())
+        self.message_user(request, f"Restored {total.tasks} tasks.")
+
+
+@admin.register(TaskType)
+class TaskTypeAdmin(admin.ModelAdmin):
+    list_display = ("name", "task_count")
+    ordering = ("name", "id")
+    search_fields = ("name",)
+
+
+@admin.register(Position)
+class PositionAdmin(admin.ModelAdmin):
+    list_display = ("name", "worker_count")
+    search_fields = ("name",)
 
 
 admin.site.unregister(Group)
 
-admin.site.register(TaskType)
 
-admin.site.register(Position)
+def superuser_only(view):
+    def wrapped(request, *args, **kwargs):
+        if not request.user.is_superuser:
+            return HttpResponseForbidden()
+        return view(request, *args, **kwargs)
+
+    return admin.site.admin_view(wrapped)
+
+
+def profile_list(request):
+    ring = profiling.get_ring()
+    return TemplateResponse(
+        request,
+        "admin/profiles.html",
+        {
+            **admin.site.each_context(request),
+            "title": "Request profiles",
+            "enabled": ring is not None,
+            "profiles": ring.entries() if ring else [],
+        },
+    )
+
+
+def profile_download(request, filename):
+    ring = profiling.get_ring()
+    path = ring.path(filename) if ring else None
+    if path is None:
+        raise Http404("No such profile.")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=filename)
+
+
+profile_urls = [
+    path("", superuser_only(profile_list), name="profile-list"),
+    path("<str:filename>", superuser_only(profile_download), name="profile-download"),
+]
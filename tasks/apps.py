@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        from tasks import counters, list_cache, live
+
+        counters.connect()
+        list_cache.connect()
+        live.connect()
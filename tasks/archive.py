@@ -0,0 +1,150 @@
+from collections import Counter as Tally
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from tasks import counters, list_cache
+from tasks.management.commands.import_data import preserve_timestamps
+from tasks.models import (
+    ArchivedAssignment,
+    ArchivedCommentary,
+    ArchivedTask,
+    Commentary,
+    Task,
+    TaskType,
+)
+
+Assignment = Task.assignees.through
+
+TASK_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type_id",
+    "comment_count",
+    "completed_at",
+]
+COMMENT_FIELDS = ["id", "user_id", "task_id", "created_time", "content"]
+ASSIGNMENT_FIELDS = ["task_id", "worker_id"]
+
+
+class Moved(NamedTuple):
+    tasks: int = 0
+    comments: int = 0
+    assignments: int = 0
+
+    def __add__(self, other):
+        return Moved(*(a + b for a, b in zip(self, other)))
+
+    def __bool__(self):
+        return self.tasks > 0
+
+
+def copy(queryset, fields, target):
+    rows = [target(**row) for row in queryset.values(*fields)]
+    target._default_manager.bulk_create(rows)
+    return rows
+
+
+def raw_delete(queryset):
+    # QuerySet.delete() would collect every row and send post_delete for
+    # each; the counters and caches are settled once per batch instead.
+    return queryset._raw_delete(queryset.db)
+
+
+def settle(task_type_counts, sign):
+    counters.adjust_many(
+        counters.COUNTERS_BY_CHILD[Task],
+        {
+            task_type_id: sign * count
+            for task_type_id, count in task_type_counts.items()
+        },
+    )
+    for model in (Task, TaskType):
+        list_cache.bump_generation(model)
+
+
+def archive_batch(queryset, batch_size):
+    """
+    Move one batch of tasks with their comments and assignments in a short
+    transaction. The task rows are locked (skipping any another worker holds),
+    so comments or assignments added concurrently wait and then fail their
+    foreign key instead of being lost.
+    """
+    with transaction.atomic():
+        tasks = list(
+            queryset.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "task_type_id")[:batch_size]
+        )
+        if not tasks:
+            return Moved()
+        ids = [pk for pk, _ in tasks]
+        copy(Task.objects.filter(id__in=ids), TASK_FIELDS, ArchivedTask)
+        comments = copy(
+            Commentary.objects.filter(task_id__in=ids),
+            COMMENT_FIELDS,
+            ArchivedCommentary,
+        )
+        assignments = copy(
+            Assignment.objects.filter(task_id__in=ids),
+            ASSIGNMENT_FIELDS,
+            ArchivedAssignment,
+        )
+        raw_delete(Assignment.objects.filter(task_id__in=ids))
+        raw_delete(Commentary.objects.filter(task_id__in=ids))
+        raw_delete(Task.objects.filter(id__in=ids))
+        settle(Tally(task_type_id for _, task_type_id in tasks), -1)
+    return Moved(len(ids), len(comments), len(assignments))
+
+
+def restore_batch(queryset, batch_size):
+    with transaction.atomic():
+        tasks = list(
+            queryset.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "task_type_id")[:batch_size]
+        )
+        if not tasks:
+            return Moved()
+        ids = [pk for pk, _ in tasks]
+        copy(ArchivedTask.objects.filter(id__in=ids), TASK_FIELDS, Task)
+        # Keeps bulk_create() from stamping auto_now_add over the real times.
+        with preserve_timestamps(Commentary):
+            comments = copy(
+                ArchivedCommentary.objects.filter(task_id__in=ids),
+                COMMENT_FIELDS,
+                Commentary,
+            )
+        assignments = copy(
+            ArchivedAssignment.objects.filter(task_id__in=ids),
+            ASSIGNMENT_FIELDS,
+            Assignment,
+        )
+        # Cascades to the archived comments and assignments.
+        ArchivedTask.objects.filter(id__in=ids).delete()
+        settle(Tally(task_type_id for _, task_type_id in tasks), 1)
+    return Moved(len(ids), len(comments), len(assignments))
+
+
+def archivable(days):
+    return Task.objects.filter(
+        is_completed=True, completed_at__lt=timezone.now() - timedelta(days=days)
+    )
+
+
+def archive(days, batch_size=500):
+    """Yield a ``Moved`` per batch until no task completed over ``days`` ago is left."""
+    while moved := archive_batch(archivable(days), batch_size):
+        yield moved
+
+
+def restore(queryset, batch_size=500):
+    """Yield a ``Moved`` per batch until ``queryset`` of archived tasks is empty."""
+    while moved := restore_batch(queryset, batch_size):
+        yield moved
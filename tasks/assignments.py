@@ -0,0 +1,98 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+
+from tasks.models import Task, Worker
+
+Assignment = Task.assignees.through
+
+# Sent once per apply() call, after the rows have been written, with the
+# ids of every task whose assignee set may have changed.
+assignments_changed = Signal()
+
+
+class InvalidAssignment(Exception):
+    pass
+
+
+def parse_pairs(items, default_worker):
+    """
+    Read ``[{"task": 1, "worker": 2}, ...]``; a missing worker means the
+    requesting user.
+    """
+    if not isinstance(items, list):
+        raise InvalidAssignment("Expected a list of assignments.")
+    pairs = set()
+    for item in items:
+        if not isinstance(item, dict):
+            raise InvalidAssignment("Each assignment must be an object.")
+        try:
+            pairs.add((int(item["task"]), int(item.get("worker", default_worker))))
+        except (KeyError, TypeError, ValueError):
+            raise InvalidAssignment(f"Invalid assignment: {item!r}")
+    return pairs
+
+
+def check_exist(model, ids):
+    found = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+    missing = sorted(set(ids) - found)
+    if missing:
+        raise InvalidAssignment(
+            f"Unknown {model._meta.verbose_name} ids: "
+            f"{', '.join(map(str, missing))}"
+        )
+
+
+def apply(assign=(), unassign=()):
+    """
+    Add and remove (task_id, worker_id) pairs with one INSERT ... ON CONFLICT
+    DO NOTHING and one DELETE on the through table. Both are idempotent, so
+    repeated or concurrent requests converge on the same rows.
+
+    Returns ``{task_id: [worker_id, ...]}`` for every task touched.
+    """
+    assign, unassign = set(assign), set(unassign)
+    if assign & unassign:
+        raise InvalidAssignment("A pair cannot be assigned and unassigned at once.")
+    task_ids = {task_id for task_id, _ in assign | unassign}
+    if not task_ids:
+        return {}
+    check_exist(Task, task_ids)
+    check_exist(Worker, {worker_id for _, worker_id in assign | unassign})
+
+    removals = defaultdict(list)
+    for task_id, worker_id in unassign:
+        removals[task_id].append(worker_id)
+
+    with transaction.atomic():
+        if assign:
+            Assignment.objects.bulk_create(
+                [Assignment(task_id=t, worker_id=w) for t, w in assign],
+                ignore_conflicts=True,
+            )
+        if unassign:
+            Assignment.objects.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(task_id=task_id, worker_id__in=worker_ids)
+                        for task_id, worker_ids in removals.items()
+                    ),
+                )
+            ).delete()
+        assignees = {task_id: [] for task_id in sorted(task_ids)}
+        for task_id, worker_id in (
+            Assignment.objects.filter(task_id__in=task_ids)
+            .order_by("task_id", "worker_id")
+            .values_list("task_id", "worker_id")
+        ):
+            assignees[task_id].append(worker_id)
+
+    assignments_changed.send(
+        sender=Task, task_ids=task_ids, assigned=assign, unassigned=unassign
+    )
+    return assignees
@@ -0,0 +1,66 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+AVATAR_SIZES = (110, 220)
+AVATAR_FORMATS = (
+    ("jpg", "JPEG", {"quality": 85, "optimize": True}),
+    ("webp", "WEBP", {"quality": 80}),
+)
+
+
+def max_avatar_pixels():
+    return getattr(settings, "AVATAR_MAX_PIXELS", 40_000_000)
+
+
+def variant_key(size, extension):
+    return f"{size}.{extension}"
+
+
+def variant_name(original_name, size, extension):
+    root, _ = os.path.splitext(original_name)
+    return f"{root}_{size}.{extension}"
+
+
+def render_variants(source):
+    with Image.open(source) as image:
+        if image.width * image.height > max_avatar_pixels():
+            raise ValueError(f"Avatar is larger than {max_avatar_pixels()} pixels")
+        # For JPEGs this decodes at a reduced DCT scale, so memory follows the
+        # thumbnail size rather than the upload size.
+        image.draft("RGB", (max(AVATAR_SIZES), max(AVATAR_SIZES)))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size in AVATAR_SIZES:
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            for extension, image_format, params in AVATAR_FORMATS:
+                buffer = io.BytesIO()
+                thumbnail.save(buffer, image_format, **params)
+                yield size, extension, buffer.getvalue()
+
+
+def delete_avatar_variants(worker):
+    storage = worker.avatar.storage
+    for name in worker.avatar_variants.values():
+        storage.delete(name)
+    worker.avatar_variants = {}
+
+
+def refresh_avatar_variants(worker, save=True):
+    delete_avatar_variants(worker)
+    if worker.avatar:
+        storage = worker.avatar.storage
+        worker.avatar.open("rb")
+        try:
+            for size, extension, content in render_variants(worker.avatar):
+                name = storage.save(
+                    variant_name(worker.avatar.name, size, extension),
+                    ContentFile(content),
+                )
+                worker.avatar_variants[variant_key(size, extension)] = name
+        finally:
+            worker.avatar.close()
+    if save:
+        worker.save(update_fields=["avatar_variants"])
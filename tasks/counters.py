@@ -0,0 +1,200 @@
+import threading
+from collections import Counter as Tally
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db.models import Count, F, Model, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from tasks.models import Commentary, Position, Task, TaskType, Worker
+
+
+class Counter(NamedTuple):
+    owner: type
+    field: str
+    child: type
+    foreign_key: str
+
+    @property
+    def attname(self):
+        return self.child._meta.get_field(self.foreign_key).attname
+
+    def __str__(self):
+        return f"{self.owner._meta.label_lower}.{self.field}"
+
+
+COUNTERS = [
+    Counter(Position, "worker_count", Worker, "position"),
+    Counter(TaskType, "task_count", Task, "task_type"),
+    Counter(Task, "comment_count", Commentary, "task"),
+]
+COUNTERS_BY_CHILD = {counter.child: counter for counter in COUNTERS}
+
+
+def adjust(counter, owner_id, delta):
+    if owner_id is not None:
+        counter.owner._default_manager.filter(pk=owner_id).update(
+            **{counter.field: F(counter.field) + delta}
+        )
+
+
+def adjust_many(counter, deltas):
+    """Apply ``{owner_id: delta}`` with one UPDATE per distinct delta."""
+    owners_by_delta = defaultdict(list)
+    for owner_id, delta in deltas.items():
+        if owner_id is not None and delta:
+            owners_by_delta[delta].append(owner_id)
+    for delta, owner_ids in owners_by_delta.items():
+        counter.owner._default_manager.filter(pk__in=owner_ids).update(
+            **{counter.field: F(counter.field) + delta}
+        )
+
+
+def count_created(model, objs):
+    """Count children inserted by bulk_create, which sends no signals."""
+    counter = COUNTERS_BY_CHILD[model]
+    adjust_many(counter, Tally(getattr(obj, counter.attname) for obj in objs))
+
+
+def actual_count(counter):
+    """Correlated subquery counting an owner's children, for use in update()."""
+    children = (
+        counter.child._default_manager.filter(**{counter.attname: OuterRef("pk")})
+        .order_by()
+        .values(counter.attname)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(children), 0)
+
+
+def reconcile(counter, batch_size=1000, fix=True):
+    """
+    Walk the owners in pk batches and yield ``(pk, stored, actual)`` for each
+    one whose counter drifted. With ``fix`` the drifted rows are recomputed by
+    the database in one UPDATE per batch.
+    """
+    owners = counter.owner._default_manager.order_by("pk")
+    last_pk = 0
+    while True:
+        batch = list(
+            owners.filter(pk__gt=last_pk).values_list("pk", counter.field)[:batch_size]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1][0]
+        actual = dict(
+            counter.child._default_manager.filter(
+                **{f"{counter.attname}__in": [pk for pk, _ in batch]}
+            )
+            .order_by()
+            .values(counter.attname)
+            .annotate(count=Count("pk"))
+            .values_list(counter.attname, "count")
+        )
+        drifted = [
+            (pk, stored, actual.get(pk, 0))
+            for pk, stored in batch
+            if stored != actual.get(pk, 0)
+        ]
+        if fix and drifted:
+            owners.filter(pk__in=[pk for pk, _, _ in drifted]).update(
+                **{counter.field: actual_count(counter)}
+            )
+        yield from drifted
+
+
+def remember_owner(sender, instance, update_fields=None, raw=False, **kwargs):
+    counter = COUNTERS_BY_CHILD[sender]
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not {
+        counter.foreign_key,
+        counter.attname,
+    } & set(update_fields):
+        return
+    instance._counter_owner_id = (
+        sender._default_manager.filter(pk=instance.pk)
+        .values_list(counter.attname, flat=True)
+        .first()
+    )
+
+
+def count_saved(sender, instance, created, raw=False, **kwargs):
+    counter = COUNTERS_BY_CHILD[sender]
+    if raw:
+        return
+    owner_id = getattr(instance, counter.attname)
+    if created:
+        adjust(counter, owner_id, 1)
+    elif "_counter_owner_id" in instance.__dict__:
+        previous_id = instance.__dict__.pop("_counter_owner_id")
+        if previous_id != owner_id:
+            adjust(counter, previous_id, -1)
+            adjust(counter, owner_id, 1)
+
+
+class PendingDelete:
+    """The rows of one delete() and the counter deltas they add up to."""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.rows = set()
+        self.deleted = defaultdict(set)
+        self.deltas = defaultdict(Tally)
+        if isinstance(origin, Model):
+            self.deleted[type(origin)].add(origin.pk)
+
+    def apply(self):
+        for counter, deltas in self.deltas.items():
+            # Owners deleted by the same cascade have no row left to update.
+            for owner_id in self.deleted[counter.owner] & deltas.keys():
+                del deltas[owner_id]
+            adjust_many(counter, deltas)
+
+
+_pending = threading.local()
+
+
+def pending_deletes():
+    if not hasattr(_pending, "deletes"):
+        _pending.deletes = {}
+    return _pending.deletes
+
+
+def collect_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Collector.delete() sends pre_delete for every row before deleting any,
+    so a whole cascade is tallied here and settled by its last post_delete.
+    """
+    deletes = pending_deletes()
+    pending = deletes.get(id(origin))
+    row = (sender, instance.pk)
+    # A row seen twice means an earlier delete() of this origin failed.
+    if pending is None or row in pending.rows:
+        pending = deletes[id(origin)] = PendingDelete(origin)
+    pending.rows.add(row)
+    pending.deleted[sender].add(instance.pk)
+    counter = COUNTERS_BY_CHILD[sender]
+    pending.deltas[counter][getattr(instance, counter.attname)] -= 1
+
+
+def count_deleted(sender, instance, origin=None, **kwargs):
+    deletes = pending_deletes()
+    pending = deletes.get(id(origin))
+    if pending is None:
+        return
+    pending.rows.discard((sender, instance.pk))
+    if not pending.rows:
+        del deletes[id(origin)]
+        pending.apply()
+
+
+def connect():
+    for counter in COUNTERS:
+        uid = f"counters:{counter}"
+        pre_save.connect(remember_owner, sender=counter.child, dispatch_uid=uid)
+        post_save.connect(count_saved, sender=counter.child, dispatch_uid=uid)
+        pre_delete.connect(collect_deleted, sender=counter.child, dispatch_uid=uid)
+        post_delete.connect(count_deleted, sender=counter.child, dispatch_uid=uid)
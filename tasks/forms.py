@@ -5,10 +5,29 @@ from django.contrib.auth.forms import (
     AuthenticationForm,
 )
 from django.contrib.auth import get_user_model
+from tasks.avatars import max_avatar_pixels, refresh_avatar_variants
 from tasks.models import Worker, Commentary, Task, TaskType, Position
+from tasks.widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
-class WorkerCreateForm(UserCreationForm):
+class AvatarVariantsMixin:
+    def clean_avatar(self):
+        avatar = self.cleaned_data.get("avatar")
+        image = getattr(avatar, "image", None)
+        if image is not None and image.width * image.height > max_avatar_pixels():
+            raise forms.ValidationError(
+                "Image is too large, please upload a smaller picture."
+            )
+        return avatar
+
+    def save(self, commit=True):
+        worker = super().save(commit=commit)
+        if commit and "avatar" in self.changed_data:
+            refresh_avatar_variants(worker)
+        return worker
+
+
+class WorkerCreateForm(AvatarVariantsMixin, UserCreationForm):
     first_name = forms.CharField(required=True)
     last_name = forms.CharField(required=True)
     email = forms.EmailField(required=True)
@@ -25,6 +44,9 @@ class WorkerCreateForm(UserCreationForm):
         help_texts = {
             "username": None,
         }
+        widgets = {
+            "position": AutocompleteSelect("tasks:position-autocomplete"),
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -32,7 +54,7 @@ class WorkerCreateForm(UserCreationForm):
             field.widget.attrs["class"] = "form-control"
 
 
-class AvatarForm(forms.ModelForm):
+class AvatarForm(AvatarVariantsMixin, forms.ModelForm):
     avatar = forms.ImageField(required=False)
 
     class Meta(UserCreationForm.Meta):
@@ -40,13 +62,16 @@ class AvatarForm(forms.ModelForm):
         fields = ("avatar",)
 
 
-class WorkerUpdateForm(UserChangeForm):
+class WorkerUpdateForm(AvatarVariantsMixin, UserChangeForm):
     class Meta:
         model = Worker
         fields = ("username", "first_name", "last_name", "email", "position", "avatar")
         help_texts = {
             "username": None,
         }
+        widgets = {
+            "position": AutocompleteSelect("tasks:position-autocomplete"),
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -68,9 +93,11 @@ class TaskTypeCreateForm(forms.ModelForm):
 
 
 class TaskCreateForm(forms.ModelForm):
+    # Validates submitted ids with one IN query; the widget renders only the
+    # selected workers and searches the rest through worker-autocomplete.
     assignees = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple(),
+        widget=AutocompleteSelectMultiple("tasks:worker-autocomplete"),
         required=False,
     )
 
@@ -81,15 +108,13 @@ class TaskCreateForm(forms.ModelForm):
             "deadline": forms.DateTimeInput(
                 attrs={"class": "form-control", "type": "datetime-local"}
             ),
-            "assignees": forms.CheckboxSelectMultiple(),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for field_name, field in self.fields.items():
-            if field_name != "assignees":
-                field.widget.attrs["class"] = "form-control"
-                field.widget.attrs["class"] += " mb-3"
+            field.widget.attrs["class"] = "form-control"
+            field.widget.attrs["class"] += " mb-3"
         self.fields["is_completed"].widget.attrs["class"] = "form-check-input"
 
 
@@ -145,6 +170,40 @@ class TaskSearchForm(forms.Form):
             }
         ),
     )
+    full_text = forms.BooleanField(
+        required=False,
+        label="Description",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input ms-2"}),
+    )
+    archived = forms.BooleanField(
+        required=False,
+        label="Archived",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input ms-2"}),
+    )
+
+
+class TaskFilterForm(forms.Form):
+    completed = forms.ChoiceField(
+        required=False,
+        choices=[("", "Any status"), ("no", "Open"), ("yes", "Completed")],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    priority = forms.ChoiceField(
+        required=False,
+        choices=[("", "Any priority"), *Task.PRIORITY_CHOICES],
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        if self.cleaned_data["completed"]:
+            queryset = queryset.filter(
+                is_completed=self.cleaned_data["completed"] == "yes"
+            )
+        if self.cleaned_data["priority"]:
+            queryset = queryset.filter(priority=self.cleaned_data["priority"])
+        return queryset
 
 
 class TaskTypeSearchForm(forms.Form):
@@ -0,0 +1,232 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from tasks.assignments import assignments_changed
+from tasks.models import Position, Task, TaskType, Worker
+
+CACHED_MODELS = (Task, Worker, Position, TaskType)
+
+
+def get_cache():
+    return caches[getattr(settings, "LIST_CACHE_ALIAS", "default")]
+
+
+def enabled():
+    """
+    Whether pages are cached at all. Generations live in the cache, so a
+    process-local backend would leave the other workers serving stale pages.
+    """
+    return getattr(settings, "LIST_CACHE_ENABLED", False)
+
+
+def generation_key(model):
+    return f"listcache:gen:{model._meta.label_lower}"
+
+
+def stats_key(model, outcome):
+    return f"listcache:stats:{model._meta.label_lower}:{outcome}"
+
+
+def assignees_key(task_pk):
+    return f"listcache:assignees:{task_pk}"
+
+
+def bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted or never read; start from a value no old key can carry.
+        cache.set(key, time.time_ns(), None)
+
+
+def current(keys):
+    cache = get_cache()
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return ".".join(str(found[key]) for key in keys)
+
+
+def bump_generation(model):
+    bump(generation_key(model))
+
+
+def assignees_version(task_pk):
+    """Version of a task's assignee cards: the set itself and how they render."""
+    return current(
+        [assignees_key(task_pk), generation_key(Worker), generation_key(Position)]
+    )
+
+
+def record_lookup(model, hit):
+    cache = get_cache()
+    key = stats_key(model, "hit" if hit else "miss")
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    cache = get_cache()
+    keys = [
+        stats_key(model, outcome)
+        for model in CACHED_MODELS
+        for outcome in ("hit", "miss")
+    ]
+    found = cache.get_many(keys)
+    return {
+        model._meta.label_lower: {
+            "hits": found.get(stats_key(model, "hit"), 0),
+            "misses": found.get(stats_key(model, "miss"), 0),
+        }
+        for model in CACHED_MODELS
+    }
+
+
+def reset_stats():
+    get_cache().delete_many(
+        [
+            stats_key(model, outcome)
+            for model in CACHED_MODELS
+            for outcome in ("hit", "miss")
+        ]
+    )
+
+
+def cacheable(result):
+    """Detach a paginate_queryset() result from its queryset so it pickles small."""
+    paginator, page, object_list, is_paginated = result
+    page.object_list = list(object_list)
+    if isinstance(paginator, Paginator):
+        paginator.num_pages  # Evaluates and caches count before the list goes.
+        paginator.object_list = ()
+    else:
+        paginator.queryset = None
+    return paginator, page, page.object_list, is_paginated
+
+
+class CachedListMixin:
+    """
+    Cache the paginated rows of a ListView, keyed by the normalized query
+    string and the generation of every model the page shows. Only data is
+    cached; the template still renders per request, so user-specific parts
+    of the page stay correct.
+    """
+
+    cache_models = ()
+
+    def get_cache_models(self):
+        return (self.model, *self.cache_models)
+
+    def get_list_cache_key(self):
+        params = sorted(
+            (key, value.strip())
+            for key, values in self.request.GET.lists()
+            for value in values
+            if value.strip()
+        )
+        digest = hashlib.md5(
+            urlencode(params).encode(), usedforsecurity=False
+        ).hexdigest()
+        versions = current([generation_key(model) for model in self.get_cache_models()])
+        return f"listcache:page:{self.model._meta.label_lower}:{versions}:{digest}"
+
+    def paginate_queryset(self, queryset, page_size):
+        if not enabled():
+            return super().paginate_queryset(queryset, page_size)
+        cache = get_cache()
+        key = self.get_list_cache_key()
+        result = cache.get(key)
+        record_lookup(self.model, result is not None)
+        self.request.list_cache_hit = result is not None
+        if result is None:
+            result = cacheable(super().paginate_queryset(queryset, page_size))
+            cache.set(key, result, settings.LIST_CACHE_TIMEOUT)
+        return result
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if not enabled():
+            return await self.apaginate_uncached(queryset, page_size)
+        cache = get_cache()
+        key = await sync_to_async(self.get_list_cache_key)()
+        result = await cache.aget(key)
+        await sync_to_async(record_lookup)(self.model, result is not None)
+        self.request.list_cache_hit = result is not None
+        if result is None:
+            result = await self.apaginate_uncached(queryset, page_size)
+            result = await sync_to_async(cacheable)(result)
+            await cache.aset(key, result, settings.LIST_CACHE_TIMEOUT)
+        return result
+
+    async def apaginate_uncached(self, queryset, page_size):
+        parent = super()
+        if hasattr(parent, "apaginate_queryset"):
+            return await parent.apaginate_queryset(queryset, page_size)
+        return await sync_to_async(parent.paginate_queryset)(queryset, page_size)
+
+
+def bump_on_commit(keys):
+    """
+    Bump ``keys`` once the writer's transaction commits; bumped earlier, a
+    concurrent request could cache the old rows under the new generation.
+    """
+    keys = list(keys)
+
+    def bump_keys():
+        for key in keys:
+            bump(key)
+
+    transaction.on_commit(bump_keys)
+
+
+def invalidate(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no list page shows.
+    if not enabled() or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    bump_on_commit([generation_key(sender)])
+
+
+def invalidate_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if not enabled() or not action.startswith("post_"):
+        return
+    keys = [generation_key(Task)]
+    if not reverse:
+        keys.append(assignees_key(instance.pk))
+    elif pk_set is not None:
+        keys += [assignees_key(pk) for pk in pk_set]
+    else:
+        # worker.assigned_tasks.clear() does not say which tasks it touched.
+        keys.append(generation_key(Worker))
+    bump_on_commit(keys)
+
+
+def invalidate_assignments(sender, task_ids, **kwargs):
+    if not enabled():
+        return
+    bump_on_commit([generation_key(Task), *map(assignees_key, task_ids)])
+
+
+def connect():
+    for model in CACHED_MODELS:
+        uid = f"list_cache:{model._meta.label_lower}"
+        post_save.connect(invalidate, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate, sender=model, dispatch_uid=uid)
+    m2m_changed.connect(
+        invalidate_m2m, sender=Task.assignees.through, dispatch_uid="list_cache:m2m"
+    )
+    assignments_changed.connect(
+        invalidate_assignments, dispatch_uid="list_cache:assignments"
+    )
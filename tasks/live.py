@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from tasks.assignments import assignments_changed
+from tasks.models import Commentary, Task
+
+
+class Subscription:
+    """One listener's bounded queue of events for a task, bound to its loop."""
+
+    def __init__(self, hub, task_id, maxsize):
+        self.hub = hub
+        self.task_id = task_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A listener this far behind should refetch rather than replay.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"task": self.task_id, "type": "reset"})
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class Hub:
+    """
+    In-process fan-out of task events to async listeners. ``deliver`` may be
+    called from any thread; events are handed to each listener's event loop
+    with one call_soon_threadsafe per loop, not per listener.
+    """
+
+    def __init__(self, broker=None):
+        self.broker = broker
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, task_id, maxsize=100):
+        subscription = Subscription(self, task_id, maxsize)
+        with self._lock:
+            self._subscriptions[task_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.task_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.task_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(map(len, self._subscriptions.values()))
+
+    def deliver(self, event):
+        by_loop = defaultdict(list)
+        with self._lock:
+            for subscription in self._subscriptions.get(event["task"], ()):
+                by_loop[subscription.loop].append(subscription)
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(fan_out, subscriptions, event)
+            except RuntimeError:
+                # The loop is closed; its listeners are gone with it.
+                for subscription in subscriptions:
+                    self.unsubscribe(subscription)
+
+    def publish(self, event):
+        self.deliver(event)
+        if self.broker is not None:
+            self.broker.send(event)
+
+
+def fan_out(subscriptions, event):
+    for subscription in subscriptions:
+        subscription.put(event)
+
+
+class SocketBroker:
+    """
+    Relays events between the worker processes of one host. Every process
+    binds a Unix datagram socket in ``directory`` and sends each event it
+    publishes to all the others; sockets of dead processes are removed on
+    the first failed send.
+    """
+
+    def __init__(self, directory, hub, name=None):
+        self.hub = hub
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{name or os.getpid()}.sock"
+        self.path.unlink(missing_ok=True)
+        self.receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.receiver.bind(str(self.path))
+        self.sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sender.setblocking(False)
+        threading.Thread(target=self.receive, daemon=True).start()
+
+    def send(self, event):
+        payload = json.dumps(event).encode()
+        for peer in self.directory.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self.sender.sendto(payload, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                # The peer is not keeping up; its listeners will miss this one.
+                pass
+
+    def receive(self):
+        while payload := self.receiver.recv(65536):
+            self.hub.deliver(json.loads(payload))
+        self.receiver.close()
+
+    def close(self):
+        # An empty datagram ends the receiving thread.
+        self.sender.sendto(b"", str(self.path))
+        self.path.unlink(missing_ok=True)
+        self.sender.close()
+
+
+_hub = None
+_hub_pid = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    """The hub of the current process, created after any fork."""
+    global _hub, _hub_pid
+    with _hub_lock:
+        if _hub is None or _hub_pid != os.getpid():
+            _hub = Hub()
+            _hub_pid = os.getpid()
+            directory = getattr(settings, "LIVE_EVENTS_SOCKET_DIR", None)
+            if directory:
+                _hub.broker = SocketBroker(directory, _hub)
+        return _hub
+
+
+def publish_on_commit(task_id, event_type, **data):
+    event = {"task": task_id, "type": event_type, "data": data}
+    transaction.on_commit(lambda: get_hub().publish(event))
+
+
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit(instance.task_id, "comment.created", id=instance.pk)
+
+
+def comment_deleted(sender, instance, **kwargs):
+    publish_on_commit(instance.task_id, "comment.deleted", id=instance.pk)
+
+
+def assignees_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        publish_on_commit(instance.pk, "assignees.changed")
+    elif pk_set is not None:
+        for task_id in pk_set:
+            publish_on_commit(task_id, "assignees.changed")
+    # worker.assigned_tasks.clear() does not say which tasks it touched.
+
+
+def assignments_applied(sender, task_ids, **kwargs):
+    for task_id in task_ids:
+        publish_on_commit(task_id, "assignees.changed")
+
+
+def connect():
+    post_save.connect(comment_saved, sender=Commentary, dispatch_uid="live:comment")
+    post_delete.connect(comment_deleted, sender=Commentary, dispatch_uid="live:comment")
+    m2m_changed.connect(
+        assignees_m2m_changed,
+        sender=Task.assignees.through,
+        dispatch_uid="live:assignees",
+    )
+    assignments_changed.connect(assignments_applied, dispatch_uid="live:assignments")
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.archive import Moved, archivable, archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tasks completed more than --days ago, with their comments and "
+        "assignments, into the archive tables in short batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=180)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tasks would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archivable(options["days"]).count()
+            self.stdout.write(f"{count} tasks would be archived.")
+            return
+
+        started = time.perf_counter()
+        total = Moved()
+        for moved in archive(options["days"], options["batch_size"]):
+            total += moved
+            if options["verbosity"] > 1:
+                self.stdout.write(f"    batch: {format_moved(moved)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {format_moved(total)} "
+                f"in {time.perf_counter() - started:.1f}s."
+            )
+        )
+
+
+def format_moved(moved):
+    return (
+        f"{moved.tasks} tasks, {moved.comments} comments, "
+        f"{moved.assignments} assignments"
+    )
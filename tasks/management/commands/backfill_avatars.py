@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from tasks.avatars import refresh_avatar_variants
+from tasks.models import Worker
+
+
+class Command(BaseCommand):
+    help = "Generate missing avatar thumbnail variants for existing workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants even for workers that already have them.",
+        )
+
+    def handle(self, *args, **options):
+        workers = Worker.objects.exclude(avatar="").exclude(avatar__isnull=True)
+        if not options["force"]:
+            workers = workers.filter(avatar_variants={})
+
+        done = failed = 0
+        for worker in workers.only("avatar", "avatar_variants").iterator():
+            try:
+                refresh_avatar_variants(worker)
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f"{worker.pk}: {worker.avatar.name}: {error}")
+            else:
+                done += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated variants for {done} workers, {failed} failed"
+            )
+        )
@@ -0,0 +1,200 @@
+import asyncio
+import contextvars
+import time
+from importlib import import_module
+from types import ModuleType, SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.asgi import get_asgi_application
+from django.test import Client, override_settings
+from django.urls import URLResolver, include, path, reverse
+from django.views import View
+
+from tasks import urls
+from tasks.management.commands.benchmark_views import SKIPPED_ROUTES, route_model
+
+
+def sync_view_class(view_class):
+    """The sync view an async one extends, or None if it only extends View."""
+    return next(
+        (
+            cls
+            for cls in view_class.__mro__
+            if issubclass(cls, View) and not cls.view_is_async and cls is not View
+        ),
+        None,
+    )
+
+
+def async_routes():
+    """Async tasks routes that have a sync counterpart to compare against."""
+    routes = []
+    for pattern in urls.urlpatterns:
+        view_class = getattr(pattern.callback, "view_class", View)
+        if (
+            view_class.view_is_async
+            and sync_view_class(view_class) is not None
+            and pattern.name not in SKIPPED_ROUTES
+        ):
+            routes.append(pattern)
+    return routes
+
+
+def sync_urlconf():
+    """The project urlconf with every async tasks view swapped for its sync base."""
+    tasks_patterns = []
+    for pattern in urls.urlpatterns:
+        view_class = getattr(pattern.callback, "view_class", View)
+        if view_class.view_is_async and sync_view_class(view_class) is not None:
+            pattern = path(
+                str(pattern.pattern),
+                sync_view_class(view_class).as_view(),
+                name=pattern.name,
+            )
+        tasks_patterns.append(pattern)
+    tasks_urls = SimpleNamespace(urlpatterns=tasks_patterns)
+
+    root = import_module(settings.ROOT_URLCONF)
+    patterns = []
+    for pattern in root.urlpatterns:
+        if isinstance(pattern, URLResolver) and pattern.namespace == urls.app_name:
+            pattern = path(
+                str(pattern.pattern),
+                include((tasks_urls, urls.app_name), namespace=urls.app_name),
+            )
+        patterns.append(pattern)
+    # The resolver cache is keyed on the urlconf, so it has to be hashable.
+    urlconf = ModuleType(f"{settings.ROOT_URLCONF}_sync")
+    urlconf.urlpatterns = patterns
+    return urlconf
+
+
+def http_scope(url, cookie):
+    path, _, query_string = url.partition("?")
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"localhost"), (b"cookie", cookie.encode())],
+        # A non-internal client address keeps the debug toolbar out of the numbers.
+        "client": ("203.0.113.1", 0),
+        "server": ("localhost", 80),
+    }
+
+
+async def get_status(application, url, cookie):
+    """Run one GET through the ASGI application, the way uvicorn would."""
+    scope = http_scope(url, cookie)
+    request_sent = False
+    statuses = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Django waits for a disconnect while the view runs; it never comes.
+        await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await application(scope, receive, send)
+    return statuses[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent requests at the async read views through the ASGI "
+        "handler, once with their sync counterparts and once as they are "
+        "routed now, and report requests per second for a single worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--user", help="Username to log in as.")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        targets = []
+        for pattern in async_routes():
+            url = self.build_url(pattern)
+            if url is None:
+                self.stdout.write(f"skip {pattern.name}: no rows to address")
+                continue
+            targets.append((pattern.name, url))
+
+        client = Client()
+        client.force_login(user)
+        cookie = "; ".join(
+            f"{morsel.key}={morsel.coded_value}" for morsel in client.cookies.values()
+        )
+        application = get_asgi_application()
+        with override_settings(ROOT_URLCONF=sync_urlconf()):
+            before = self.run_all(application, cookie, targets, options)
+        after = self.run_all(application, cookie, targets, options)
+
+        self.stdout.write(
+            f"{'route':<22}{'sync req/s':>12}{'async req/s':>13}{'change':>9}"
+        )
+        for name, _ in targets:
+            change = (after[name] / max(before[name], 0.01) - 1) * 100
+            self.stdout.write(
+                f"{name:<22}{before[name]:>12.1f}{after[name]:>13.1f}"
+                f"{change:>+8.0f}%"
+            )
+
+    def get_user(self, username):
+        users = get_user_model().objects.order_by("-is_superuser", "pk")
+        user = users.filter(username=username).first() if username else users.first()
+        if user is None:
+            raise CommandError("No user to log in as; run generate_data first.")
+        return user
+
+    def build_url(self, pattern):
+        if "pk" not in pattern.pattern.converters:
+            return reverse(f"tasks:{pattern.name}")
+        pk = route_model(pattern).objects.values_list("pk", flat=True).first()
+        if pk is None:
+            return None
+        return reverse(f"tasks:{pattern.name}", kwargs={"pk": pk})
+
+    def run_all(self, application, cookie, targets, options):
+        return {
+            # asyncio.run rather than async_to_sync: like uvicorn, no outer
+            # thread is waiting on the loop to run thread-sensitive code. The
+            # empty context drops any executor an earlier async_to_sync in
+            # this thread left behind.
+            name: contextvars.Context().run(
+                asyncio.run,
+                self.throughput(
+                    application,
+                    cookie,
+                    url,
+                    options["requests"],
+                    options["concurrency"],
+                ),
+            )
+            for name, url in targets
+        }
+
+    async def throughput(self, application, cookie, url, requests, concurrency):
+        remaining = iter(range(requests))
+
+        async def consume():
+            for _ in remaining:
+                status = await get_status(application, url, cookie)
+                if status != 200:
+                    raise CommandError(f"{url} returned {status}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(consume() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
@@ -0,0 +1,164 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from tasks import live
+from tasks.management.commands.benchmark_concurrency import http_scope
+from tasks.management.commands.benchmark_views import percentile
+from tasks.models import Task
+
+
+class Listener:
+    """One idle event-stream connection driven through the ASGI application."""
+
+    def __init__(self, url, cookie, tally):
+        self.url = url
+        self.cookie = cookie
+        self.tally = tally
+        self.status = None
+        self.opened = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.received = []
+
+    async def run(self, application):
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await self.closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                self.status = message["status"]
+            elif message["type"] == "http.response.body":
+                if message["body"].startswith(b"event: "):
+                    self.received.append(time.perf_counter())
+                    self.tally.add()
+                self.opened.set()
+
+        await application(http_scope(self.url, self.cookie), receive, send)
+        self.opened.set()
+
+
+class Tally:
+    def __init__(self):
+        self.count = 0
+        self.target = None
+        self.reached = asyncio.Event()
+
+    def expect(self, target):
+        self.target = target
+        self.reached.clear()
+        if self.count >= target:
+            self.reached.set()
+
+    def add(self):
+        self.count += 1
+        if self.target is not None and self.count >= self.target:
+            self.reached.set()
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold --connections idle task event streams open through the ASGI "
+        "handler in this one process, then publish --events rounds of one "
+        "event per task and report the memory per connection and how long the "
+        "fan-out took to reach every listener."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=2000)
+        parser.add_argument(
+            "--tasks", type=int, default=10, help="Spread the streams over this many."
+        )
+        parser.add_argument("--events", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--user", help="Username to log in as.")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        task_ids = list(
+            Task.objects.order_by("pk").values_list("pk", flat=True)[: options["tasks"]]
+        )
+        if not task_ids:
+            raise CommandError("No tasks to listen to; run generate_data first.")
+        client = Client()
+        client.force_login(user)
+        cookie = "; ".join(
+            f"{morsel.key}={morsel.coded_value}" for morsel in client.cookies.values()
+        )
+        asyncio.run(self.benchmark(get_asgi_application(), cookie, task_ids, options))
+
+    def get_user(self, username):
+        users = get_user_model().objects.order_by("-is_superuser", "pk")
+        user = users.filter(username=username).first() if username else users.first()
+        if user is None:
+            raise CommandError("No user to log in as; run generate_data first.")
+        return user
+
+    async def benchmark(self, application, cookie, task_ids, options):
+        hub = live.get_hub()
+        tally = Tally()
+        urls = [reverse("tasks:task-events", kwargs={"pk": pk}) for pk in task_ids]
+        listeners = [
+            Listener(urls[i % len(urls)], cookie, tally)
+            for i in range(options["connections"])
+        ]
+        running = []
+
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        for offset in range(0, len(listeners), options["batch_size"]):
+            batch = listeners[offset : offset + options["batch_size"]]
+            running += [
+                asyncio.create_task(listener.run(application)) for listener in batch
+            ]
+            await asyncio.wait_for(
+                asyncio.gather(*(listener.opened.wait() for listener in batch)),
+                options["timeout"],
+            )
+        opened = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0] - memory_before
+        tracemalloc.stop()
+
+        failed = sum(listener.status != 200 for listener in listeners)
+        if failed:
+            raise CommandError(f"{failed} streams did not open with 200.")
+        self.stdout.write(
+            f"opened {len(listeners)} streams in {opened:.2f}s, "
+            f"{hub.subscriber_count()} subscribed, "
+            f"{memory / len(listeners) / 1024:.1f} KiB each"
+        )
+
+        self.stdout.write(f"{'round':<8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for round_ in range(options["events"]):
+            tally.expect((round_ + 1) * len(listeners))
+            published = time.perf_counter()
+            for pk in task_ids:
+                hub.publish({"task": pk, "type": "benchmark", "data": {}})
+            await asyncio.wait_for(tally.reached.wait(), options["timeout"])
+            latencies = [
+                (listener.received[round_] - published) * 1000 for listener in listeners
+            ]
+            self.stdout.write(
+                f"{round_ + 1:<8}{statistics.median(latencies):>10.2f}"
+                f"{percentile(latencies, 0.95):>10.2f}{max(latencies):>10.2f}"
+            )
+
+        for listener in listeners:
+            listener.closed.set()
+        await asyncio.gather(*running)
+        self.stdout.write(f"closed, {hub.subscriber_count()} still subscribed")
@@ -0,0 +1,149 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks import urls
+from tasks.models import Task, Worker, Commentary
+
+# Routes that change data even on GET, only accept POST, or never finish
+# (event streams; see benchmark_events).
+SKIPPED_ROUTES = {
+    "comment-delete",
+    "worker-assign-remove",
+    "assignments",
+    "task-events",
+}
+
+# Routes whose <pk> does not belong to the view's own model.
+PK_MODELS = {
+    "comment-list": Task,
+    "comment-since": Task,
+    "task-events": Task,
+    "avatar-upload": Worker,
+    "worker-task-history": Worker,
+    "comment-delete": Commentary,
+}
+
+
+def route_model(pattern):
+    if pattern.name in PK_MODELS:
+        return PK_MODELS[pattern.name]
+    return getattr(getattr(pattern.callback, "view_class", None), "model", None)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every route in tasks/urls.py with the test client against the "
+        "current database and report p50/p95 latency and query counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20)
+        parser.add_argument("--user", help="Username to log in as.")
+        parser.add_argument("--output", help="Write the results as JSON here.")
+        parser.add_argument("--compare", help="Baseline JSON to compare against.")
+        parser.add_argument(
+            "--without-middleware",
+            action="append",
+            default=[],
+            metavar="PATH",
+            help="Leave this middleware out, e.g. to measure what it costs.",
+        )
+
+    def handle(self, *args, **options):
+        middleware = [
+            path
+            for path in settings.MIDDLEWARE
+            if path not in options["without_middleware"]
+        ]
+        results = {}
+        with override_settings(MIDDLEWARE=middleware):
+            client = self.make_client(options["user"])
+            for pattern in urls.urlpatterns:
+                if pattern.name in SKIPPED_ROUTES:
+                    continue
+                url = self.build_url(pattern)
+                if url is None:
+                    self.stdout.write(f"skip {pattern.name}: no rows to address")
+                    continue
+                results[pattern.name] = self.measure(client, url, options["requests"])
+
+        baseline = {}
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as f:
+                baseline = json.load(f)
+        self.report(results, baseline)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Saved results to {options['output']}")
+
+    def make_client(self, username):
+        users = get_user_model().objects.order_by("-is_superuser", "pk")
+        user = users.filter(username=username).first() if username else users.first()
+        if user is None:
+            raise CommandError("No user to log in as; run generate_data first.")
+        # A non-internal REMOTE_ADDR keeps the debug toolbar out of the numbers.
+        client = Client(HTTP_HOST="localhost", REMOTE_ADDR="203.0.113.1")
+        client.force_login(user)
+        return client
+
+    def build_url(self, pattern):
+        if "pk" not in pattern.pattern.converters:
+            return reverse(f"tasks:{pattern.name}")
+        model = route_model(pattern)
+        pk = model.objects.values_list("pk", flat=True).first() if model else None
+        if pk is None:
+            return None
+        return reverse(f"tasks:{pattern.name}", kwargs={"pk": pk})
+
+    def measure(self, client, url, requests):
+        timings = []
+        queries = []
+        status = None
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            status = response.status_code
+        return {
+            "url": url,
+            "status": status,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "queries": max(queries),
+        }
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f"{'route':<22}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}"
+        )
+        for name, result in results.items():
+            line = (
+                f"{name:<22}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                f"{result['p95_ms']:>10.2f}{result['queries']:>9}"
+            )
+            previous = baseline.get(name)
+            if previous:
+                change = (result["p50_ms"] / max(previous["p50_ms"], 0.01) - 1) * 100
+                line += (
+                    f"   p50 {change:+.0f}%, queries "
+                    f"{result['queries'] - previous['queries']:+d}"
+                )
+            self.stdout.write(line)
@@ -0,0 +1,121 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from tasks import views
+from tasks.models import Position, TaskType, Task, Worker
+
+
+def list_view_query(view_class, **kwargs):
+    view = view_class()
+    view.setup(RequestFactory().get("/"), **kwargs)
+    queryset = view.get_queryset()
+    ordering = getattr(view, "get_keyset_ordering", lambda: None)()
+    if ordering:
+        queryset = queryset.order_by(*ordering)
+    return queryset[: view.get_paginate_by(queryset) or 10]
+
+
+def first_pk(model):
+    return model.objects.values_list("pk", flat=True).first() or 0
+
+
+QUERY_CHECKS = {
+    "tasks:position-list": lambda: list_view_query(views.PositionListView),
+    "tasks:task-type-list": lambda: list_view_query(views.TaskTypeListView),
+    "tasks:task-list": lambda: list_view_query(views.TaskListView),
+    "tasks:worker-list": lambda: list_view_query(views.WorkerListView),
+    "tasks:comment-list": lambda: list_view_query(
+        views.CommentListView, pk=first_pk(Task)
+    ),
+    "tasks:position-detail": lambda: Worker.objects.filter(
+        position_id=first_pk(Position)
+    ).order_by("username", "id")[:13],
+    "tasks:task-type-detail": lambda: Task.objects.filter(
+        task_type_id=first_pk(TaskType)
+    ).order_by("name", "-deadline", "id")[:6],
+    "tasks:task-detail": lambda: Worker.objects.filter(assigned_tasks=first_pk(Task)),
+    "tasks:worker-detail": lambda: Task.objects.filter(
+        assignees=first_pk(Worker), is_completed=False
+    ).order_by("deadline", "id")[:11],
+    "open-tasks-by-deadline": lambda: Task.objects.filter(
+        is_completed=False, deadline__lt=timezone.now()
+    ).order_by("deadline")[:10],
+}
+
+
+def walk_plan(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk_plan(child)
+
+
+def postgres_problems(queryset, max_rows):
+    plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+    return [
+        f"{node['Node Type']} on {node.get('Relation Name', '-')} "
+        f"(~{node['Plan Rows']} rows)"
+        for node in walk_plan(plan)
+        if node["Node Type"] in ("Seq Scan", "Sort") and node["Plan Rows"] > max_rows
+    ]
+
+
+def table_rows(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+        return cursor.fetchone()[0]
+
+
+def sqlite_problems(queryset, max_rows):
+    # SQLite has no row estimates, so the current table size stands in.
+    problems = []
+    for line in queryset.explain().splitlines():
+        detail = line.split(" ", 3)[-1]
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            table = detail.split()[1]
+            rows = table_rows(table)
+        elif detail.startswith("USE TEMP B-TREE"):
+            rows = table_rows(queryset.model._meta.db_table)
+        else:
+            continue
+        if rows > max_rows:
+            problems.append(f"{detail} (~{rows} rows)")
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the main query of each view and fail if any plan "
+        "falls back to a sequential scan or a sort above --max-rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-rows", type=int, default=1000)
+        parser.add_argument("--only", nargs="*", choices=sorted(QUERY_CHECKS))
+
+    def handle(self, *args, **options):
+        if connection.vendor == "postgresql":
+            find_problems = postgres_problems
+        elif connection.vendor == "sqlite":
+            find_problems = sqlite_problems
+        else:
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        failed = []
+        for name in options["only"] or QUERY_CHECKS:
+            problems = find_problems(QUERY_CHECKS[name](), options["max_rows"])
+            if problems:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}"))
+                for problem in problems:
+                    self.stdout.write(f"    {problem}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK   {name}"))
+
+        if failed:
+            raise CommandError(
+                f"{len(failed)} query plan(s) failed: {', '.join(failed)}"
+            )
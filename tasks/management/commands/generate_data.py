@@ -0,0 +1,174 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.counters import COUNTERS_BY_CHILD, count_created
+from tasks.management.commands.import_data import batched, preserve_timestamps
+from tasks.models import Position, TaskType, Worker, Task, Commentary
+
+WORDS = (
+    "fix refactor deploy review migrate document optimize design test audit "
+    "api login billing cache search report dashboard import export queue "
+    "mobile backend frontend database invoice profile settings release"
+).split()
+
+
+def skewed_choice(rng, values, skew):
+    return values[min(int(len(values) * rng.random() ** skew), len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic positions, task types, workers, tasks, "
+        "assignments and commentaries with bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--positions", type=int, default=20)
+        parser.add_argument("--task-types", type=int, default=10)
+        parser.add_argument("--workers", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument(
+            "--max-assignees",
+            type=int,
+            default=5,
+            help="Each task gets a uniform 0..N number of assignees.",
+        )
+        parser.add_argument(
+            "--completed-ratio",
+            type=float,
+            default=0.6,
+            help="Share of tasks generated as completed.",
+        )
+        parser.add_argument(
+            "--deadline-days",
+            type=int,
+            default=365,
+            help="Deadlines spread uniformly over +/- this many days.",
+        )
+        parser.add_argument(
+            "--comment-skew",
+            type=float,
+            default=2.0,
+            help="1 spreads comments evenly; higher values pile them on few tasks.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        position_ids = self.create_with_ids(
+            Position,
+            (Position(name=self.title(2)) for _ in range(options["positions"])),
+        )
+        task_type_ids = self.create_with_ids(
+            TaskType,
+            (TaskType(name=self.title(1)) for _ in range(options["task_types"])),
+        )
+        worker_ids = self.create_with_ids(
+            Worker, self.workers(options["workers"], position_ids)
+        )
+        task_ids = self.create_with_ids(
+            Task, self.tasks(options["tasks"], task_type_ids, options)
+        )
+        self.create(
+            Task.assignees.through,
+            self.assignments(task_ids, worker_ids, options["max_assignees"]),
+        )
+        with preserve_timestamps(Commentary):
+            self.create(
+                Commentary,
+                self.comments(options["comments"], task_ids, worker_ids, options),
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s")
+        )
+
+    def title(self, words):
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize()
+
+    def create(self, model, objects):
+        started = time.perf_counter()
+        created = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                # bulk_create skips the signals that maintain the counters.
+                if model in COUNTERS_BY_CHILD:
+                    count_created(model, batch)
+            created += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{model._meta.db_table}: {created} rows in {elapsed:.1f}s "
+            f"({created / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+
+    def create_with_ids(self, model, objects):
+        last_id = model.objects.order_by("-pk").values_list("pk", flat=True).first()
+        self.create(model, objects)
+        return list(
+            model.objects.filter(pk__gt=last_id or 0)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def workers(self, count, position_ids):
+        password = make_password("password")
+        start = (
+            Worker.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        ) + 1
+        for number in range(start, start + count):
+            yield Worker(
+                username=f"user{number}",
+                first_name=self.rng.choice(WORDS).capitalize(),
+                last_name=self.rng.choice(WORDS).capitalize(),
+                email=f"user{number}@example.com",
+                password=password,
+                position_id=self.rng.choice(position_ids),
+            )
+
+    def tasks(self, count, task_type_ids, options):
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        spread = options["deadline_days"] * 24 * 3600
+        for _ in range(count):
+            deadline = self.now + timedelta(seconds=self.rng.randint(-spread, spread))
+            is_completed = self.rng.random() < options["completed_ratio"]
+            yield Task(
+                name=self.title(3),
+                description=" ".join(self.rng.choices(WORDS, k=30)),
+                deadline=deadline,
+                is_completed=is_completed,
+                completed_at=min(deadline, self.now) if is_completed else None,
+                priority=self.rng.choices(priorities, weights=(1, 2, 4, 3))[0],
+                task_type_id=self.rng.choice(task_type_ids),
+            )
+
+    def assignments(self, task_ids, worker_ids, max_assignees):
+        through = Task.assignees.through
+        for task_id in task_ids:
+            count = self.rng.randint(0, min(max_assignees, len(worker_ids)))
+            for worker_id in self.rng.sample(worker_ids, count):
+                yield through(task_id=task_id, worker_id=worker_id)
+
+    def comments(self, count, task_ids, worker_ids, options):
+        if not task_ids or not worker_ids:
+            return
+        spread = options["deadline_days"] * 24 * 3600
+        for _ in range(count):
+            yield Commentary(
+                task_id=skewed_choice(self.rng, task_ids, options["comment_skew"]),
+                user_id=self.rng.choice(worker_ids),
+                content=" ".join(self.rng.choices(WORDS, k=12)),
+                created_time=self.now - timedelta(seconds=self.rng.randint(0, spread)),
+            )
@@ -0,0 +1,298 @@
+import gzip
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from tasks.counters import COUNTERS, reconcile
+from tasks.management.commands.export_data import (
+    EXPORT_FORMAT,
+    EXPORT_MODELS,
+    PERMISSION_MODELS,
+)
+
+
+# Definitions of the indexes dropped for the load, kept in the input
+# directory until they are rebuilt.
+INDEX_STATE_FILE = "dropped_indexes.json"
+
+
+def read_rows(path, skip_through_pk=None):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if skip_through_pk is not None and row["id"] <= skip_through_pk:
+                continue
+            yield row
+
+
+def first_row(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        line = f.readline()
+    return json.loads(line) if line else {}
+
+
+def with_permission_ids(rows):
+    """Swap the exported permission natural keys for this database's ids."""
+    ids = {
+        (app_label, model, codename): pk
+        for pk, app_label, model, codename in Permission.objects.values_list(
+            "pk", "content_type__app_label", "content_type__model", "codename"
+        )
+    }
+    for row in rows:
+        key = tuple(row.pop("permission"))
+        if key not in ids:
+            raise CommandError(
+                f"Unknown permission {'.'.join(key)}; run migrate before importing."
+            )
+        row["permission_id"] = ids[key]
+        yield row
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@contextmanager
+def preserve_timestamps(model):
+    # bulk_create honours auto_now/auto_now_add, which would overwrite the
+    # timestamps carried by the rows being inserted.
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    for field, _, _ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        # JSONField values; str() would give a Python repr.
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def can_copy():
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return not is_psycopg3
+
+
+class Command(BaseCommand):
+    help = (
+        "Load an export_data directory with batched bulk inserts (COPY on "
+        "PostgreSQL), in foreign key order, then reset sequences."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Directory written by export_data.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue a failed import, skipping rows already loaded.",
+        )
+        parser.add_argument(
+            "--keep-indexes",
+            action="store_true",
+            help="Do not drop and rebuild secondary indexes around the load.",
+        )
+
+    def handle(self, *args, **options):
+        with open(
+            os.path.join(options["input"], "manifest.json"), encoding="utf-8"
+        ) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != EXPORT_FORMAT:
+            raise CommandError(f"Unsupported export format: {manifest.get('format')}")
+        files = {table["model"]: table for table in manifest["tables"]}
+
+        self.use_copy = can_copy()
+        self.index_state_path = os.path.join(options["input"], INDEX_STATE_FILE)
+        self.index_state = {}
+        if os.path.exists(self.index_state_path):
+            with open(self.index_state_path, encoding="utf-8") as f:
+                self.index_state = json.load(f)
+        defer_indexes = (
+            connection.vendor == "postgresql" and not options["keep_indexes"]
+        )
+        started = time.perf_counter()
+        total = 0
+        stale_counters = []
+
+        for model in EXPORT_MODELS:
+            table = files.get(model._meta.label_lower)
+            if table is None:
+                raise CommandError(f"{model._meta.label_lower} is missing from export")
+            last_pk = model._default_manager.order_by("-pk").values_list(
+                "pk", flat=True
+            )[:1]
+            last_pk = last_pk[0] if last_pk else None
+            if last_pk is not None and not options["resume"]:
+                raise CommandError(
+                    f"{model._meta.db_table} is not empty; use --resume to continue "
+                    "a previous import."
+                )
+
+            path = os.path.join(options["input"], table["file"])
+            # Exports made before the counter columns existed load them as 0.
+            columns = first_row(path)
+            stale_counters += [
+                counter
+                for counter in COUNTERS
+                if counter.owner is model and columns and counter.field not in columns
+            ]
+            if defer_indexes:
+                self.drop_indexes(model)
+            try:
+                rows = read_rows(path, last_pk)
+                if model in PERMISSION_MODELS:
+                    rows = with_permission_ids(rows)
+                loaded, elapsed = self.load(model, rows, options["batch_size"])
+            finally:
+                # Also rebuilds what an interrupted import left dropped.
+                self.create_indexes(model)
+            total += loaded
+            self.stdout.write(
+                f"{model._meta.db_table:<24}{loaded:>10} rows{elapsed:>8.1f}s"
+                f"{loaded / max(elapsed, 1e-9):>10.0f} rows/s"
+            )
+
+        self.reset_sequences()
+        for counter in stale_counters:
+            for _ in reconcile(counter, options["batch_size"]):
+                pass
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} rows in {elapsed:.1f}s, "
+                f"{total / max(elapsed, 1e-9):.0f} rows/s"
+            )
+        )
+
+    def load(self, model, rows, batch_size):
+        started = time.perf_counter()
+        loaded = 0
+        with preserve_timestamps(model):
+            for batch in batched(rows, batch_size):
+                with transaction.atomic():
+                    if self.use_copy:
+                        self.copy_batch(model, batch)
+                    else:
+                        model._default_manager.bulk_create(
+                            [model(**row) for row in batch], batch_size=batch_size
+                        )
+                loaded += len(batch)
+        return loaded, time.perf_counter() - started
+
+    def copy_batch(self, model, batch):
+        columns = list(batch[0])
+        buffer = io.StringIO()
+        for row in batch:
+            buffer.write("\t".join(copy_value(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(
+                f"COPY {quote(model._meta.db_table)} "
+                f"({', '.join(quote(column) for column in columns)}) FROM STDIN",
+                buffer,
+            )
+
+    def secondary_indexes(self, model):
+        """
+        ``(name, definition)`` of the table's indexes that no constraint
+        owns, as pg_indexes reports them: model indexes, the ones migrations
+        add with RunSQL (trigram, full text) and the foreign key indexes.
+        Unique indexes are kept so the load still enforces them.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT indexname, indexdef FROM pg_indexes
+                WHERE schemaname = current_schema() AND tablename = %s
+                AND indexdef NOT LIKE 'CREATE UNIQUE INDEX%%'
+                AND indexname NOT IN (
+                    SELECT conname FROM pg_constraint
+                    WHERE conrelid = %s::regclass
+                )
+                """,
+                [model._meta.db_table, connection.ops.quote_name(model._meta.db_table)],
+            )
+            return cursor.fetchall()
+
+    def drop_indexes(self, model):
+        table = model._meta.db_table
+        indexes = dict(self.index_state.get(table, []))
+        indexes.update(self.secondary_indexes(model))
+        # Saved before dropping, so a killed import can still rebuild them.
+        self.index_state[table] = sorted(indexes.items())
+        self.save_index_state()
+        with connection.cursor() as cursor:
+            for name in indexes:
+                cursor.execute(
+                    f"DROP INDEX IF EXISTS {connection.ops.quote_name(name)}"
+                )
+
+    def create_indexes(self, model):
+        table = model._meta.db_table
+        if not self.index_state.get(table):
+            return
+        existing = {name for name, _ in self.secondary_indexes(model)}
+        with connection.cursor() as cursor:
+            for name, definition in self.index_state[table]:
+                if name not in existing:
+                    cursor.execute(definition)
+        del self.index_state[table]
+        self.save_index_state()
+
+    def save_index_state(self):
+        if not self.index_state:
+            if os.path.exists(self.index_state_path):
+                os.remove(self.index_state_path)
+            return
+        temporary = f"{self.index_state_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.index_state, f, indent=2)
+        os.replace(temporary, self.index_state_path)
+
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(no_style(), EXPORT_MODELS)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from tasks.list_cache import reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counts for the cached list pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters afterwards."
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'model':<18}{'hits':>10}{'misses':>10}{'hit rate':>10}")
+        for label, counts in stats().items():
+            lookups = counts["hits"] + counts["misses"]
+            rate = counts["hits"] / lookups * 100 if lookups else 0
+            self.stdout.write(
+                f"{label:<18}{counts['hits']:>10}{counts['misses']:>10}{rate:>9.0f}%"
+            )
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.counters import COUNTERS, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized worker, task and comment counters in pk "
+        "batches and report (and by default fix) any drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without updating the counters.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for counter in COUNTERS:
+            started = time.perf_counter()
+            drifted = 0
+            for pk, stored, actual in reconcile(
+                counter, options["batch_size"], fix=not options["dry_run"]
+            ):
+                drifted += 1
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"    pk={pk}: stored {stored}, actual {actual}")
+            total += drifted
+            self.stdout.write(
+                f"{str(counter):<28}{drifted:>8} drifted"
+                f"{time.perf_counter() - started:>8.1f}s"
+            )
+
+        if not total:
+            self.stdout.write(self.style.SUCCESS("All counters are correct."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{total} counters have drifted."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {total} counters."))
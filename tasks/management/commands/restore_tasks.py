@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.archive import Moved, restore
+from tasks.management.commands.archive_tasks import format_moved
+from tasks.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    help = "Move archived tasks, with their comments and assignments, back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Archived task ids.")
+        parser.add_argument(
+            "--all", action="store_true", help="Restore every archived task."
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["all"] == bool(options["ids"]):
+            raise CommandError("Pass either task ids or --all.")
+        queryset = ArchivedTask.objects.all()
+        if options["ids"]:
+            queryset = queryset.filter(id__in=options["ids"])
+            missing = set(options["ids"]) - set(queryset.values_list("id", flat=True))
+            if missing:
+                self.stderr.write(
+                    f"Not archived: {', '.join(map(str, sorted(missing)))}"
+                )
+
+        total = Moved()
+        for moved in restore(queryset, options["batch_size"]):
+            total += moved
+        self.stdout.write(self.style.SUCCESS(f"Restored {format_moved(total)}."))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from tasks.models import SlowQuery
+
+ORDERINGS = {
+    "total": F("total_ms").desc(),
+    "count": F("count").desc(),
+    "mean": (F("total_ms") / F("count")).desc(),
+    "max": F("max_ms").desc(),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the slow query fingerprints recorded by SlowQueryMiddleware, "
+        "top first, with where they were last run from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--order-by", choices=ORDERINGS, default="total")
+        parser.add_argument("--view", help="Only queries last run by this view.")
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the captured EXPLAIN plans."
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Delete the records afterwards."
+        )
+
+    def handle(self, *args, **options):
+        queries = SlowQuery.objects.order_by(ORDERINGS[options["order_by"]], "id")
+        if options["view"]:
+            queries = queries.filter(view=options["view"])
+
+        self.stdout.write(
+            f"{'total ms':>12}{'count':>8}{'mean ms':>10}{'max ms':>10}  view"
+        )
+        for query in queries[: options["limit"]]:
+            self.stdout.write(
+                f"{query.total_ms:>12.1f}{query.count:>8}"
+                f"{query.total_ms / query.count:>10.1f}{query.max_ms:>10.1f}  "
+                f"{query.view or '-'}"
+            )
+            self.stdout.write(f"    {query.fingerprint[:300]}")
+            for label, location in (
+                ("caller", query.caller),
+                ("template", query.template),
+            ):
+                if location:
+                    self.stdout.write(f"    {label}: {location}")
+            if options["plans"] and query.plan:
+                self.stdout.write("    " + query.plan.replace("\n", "\n    "))
+
+        if options["reset"]:
+            count, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"Deleted {count} records.")
@@ -0,0 +1,185 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name: (type, help, histogram buckets)
+METRICS = {
+    "http_request_duration_seconds": (
+        "histogram",
+        "Time from the request reaching the view layer to the response, by URL name.",
+        LATENCY_BUCKETS,
+    ),
+    "http_responses_total": ("counter", "Responses by URL name and status.", None),
+    "db_queries_total": ("counter", "SQL queries run, by URL name.", None),
+    "db_query_seconds_total": (
+        "counter",
+        "Time spent in SQL queries, by URL name.",
+        None,
+    ),
+    "template_render_seconds": (
+        "histogram",
+        "Template render time of template responses, by URL name.",
+        LATENCY_BUCKETS,
+    ),
+    "list_cache_lookups_total": (
+        "counter",
+        "Cached list page lookups (tasks.list_cache), by URL name and result.",
+        None,
+    ),
+}
+
+NAMESPACE = "task_manager"
+
+
+class Registry:
+    """
+    Counters and histograms of this process. Samples are keyed by sample
+    name and a tuple of (label, value) pairs; histograms keep one
+    non-cumulative count per bucket and are made cumulative on export.
+
+    With a ``directory``, the samples are written to ``<pid>.json`` in it at
+    most every ``flush_interval`` seconds, and ``collect`` sums the files of
+    every process that ever wrote there. Only counters are kept, so summing
+    is always valid, and the files of exited workers keep their counts.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0, name=None):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self.values = defaultdict(float)
+        self.lock = threading.Lock()
+        self.flushed = time.monotonic()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.path = self.directory / f"{name or os.getpid()}.json"
+
+    def inc(self, name, labels, value=1):
+        with self.lock:
+            self.values[(name, labels)] += value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        index = bisect_left(buckets, value)
+        bound = buckets[index] if index < len(buckets) else math.inf
+        with self.lock:
+            self.values[(f"{name}_bucket", (*labels, ("le", bound)))] += 1
+            self.values[(f"{name}_sum", labels)] += value
+            self.values[(f"{name}_count", labels)] += 1
+
+    def maybe_flush(self):
+        if (
+            self.directory is not None
+            and time.monotonic() - self.flushed >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            samples = [
+                [name, labels, value] for (name, labels), value in self.values.items()
+            ]
+            self.flushed = time.monotonic()
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(samples))
+        os.replace(temporary, self.path)
+
+    def collect(self):
+        merged = defaultdict(float)
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                if path == self.path:
+                    continue
+                try:
+                    samples = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, labels, value in samples:
+                    merged[(name, tuple(map(tuple, labels)))] += value
+        with self.lock:
+            for key, value in self.values.items():
+                merged[key] += value
+        return merged
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{label}="{format_value(value) if label == "le" else escape(value)}"'
+        for label, value in labels
+    )
+    return f"{{{pairs}}}"
+
+
+def escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def exposition(samples):
+    """Render merged samples in the Prometheus text exposition format."""
+    by_name = defaultdict(dict)
+    for (name, labels), value in samples.items():
+        by_name[name][labels] = value
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        full_name = f"{NAMESPACE}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        if kind == "counter":
+            for labels, value in sorted(by_name[name].items()):
+                lines.append(
+                    f"{full_name}{format_labels(labels)} {format_value(value)}"
+                )
+            continue
+        counts = by_name[f"{name}_bucket"]
+        for labels in sorted(by_name[f"{name}_count"]):
+            cumulative = 0
+            for bound in (*buckets, math.inf):
+                cumulative += counts.get((*labels, ("le", bound)), 0)
+                lines.append(
+                    f"{full_name}_bucket{format_labels((*labels, ('le', bound)))} "
+                    f"{format_value(cumulative)}"
+                )
+            lines.append(
+                f"{full_name}_sum{format_labels(labels)} "
+                f"{format_value(by_name[f'{name}_sum'][labels])}"
+            )
+            lines.append(
+                f"{full_name}_count{format_labels(labels)} "
+                f"{format_value(by_name[f'{name}_count'][labels])}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+_registry = None
+_registry_pid = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The registry of the current process, created after any fork."""
+    global _registry, _registry_pid
+    with _registry_lock:
+        if _registry is None or _registry_pid != os.getpid():
+            _registry = Registry(getattr(settings, "METRICS_DIR", None))
+            _registry_pid = os.getpid()
+            if _registry.directory is not None:
+                atexit.register(_registry.flush)
+        return _registry
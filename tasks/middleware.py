@@ -0,0 +1,245 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connection
+
+from tasks import profiling, slow_queries
+from tasks.metrics import get_registry
+
+logger = logging.getLogger("tasks.query_budget")
+slow_query_logger = logging.getLogger("tasks.slow_queries")
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \((?:[^()]+)\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint_sql(sql):
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    @property
+    def duplicates(self):
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts SQL queries, DB time, duplicated query fingerprints and template
+    render time per resolved URL name and checks them against
+    ``settings.QUERY_BUDGETS``. Breaches are logged as one JSON line each,
+    or raised when ``settings.QUERY_BUDGET_RAISE`` is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._render_time = None
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return response
+
+        report = {
+            "view": match.view_name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_time_ms": round(recorder.db_time * 1000, 2),
+            "render_time_ms": (
+                None
+                if request._render_time is None
+                else round(request._render_time * 1000, 2)
+            ),
+            "duplicates": recorder.duplicates,
+        }
+        request.query_report = report
+        breaches = self.check_budget(report)
+        if breaches:
+            report["breaches"] = breaches
+            if getattr(settings, "QUERY_BUDGET_RAISE", False):
+                raise QueryBudgetExceeded(json.dumps(report))
+            logger.warning(json.dumps({"event": "query_budget_exceeded", **report}))
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def finished(rendered):
+            request._render_time = time.perf_counter() - start
+
+        response.add_post_render_callback(finished)
+        return response
+
+    def check_budget(self, report):
+        budget = {
+            **getattr(settings, "QUERY_BUDGET_DEFAULT", {}),
+            **getattr(settings, "QUERY_BUDGETS", {}).get(report["view"], {}),
+        }
+        measured = {
+            "queries": report["queries"],
+            "db_time_ms": report["db_time_ms"],
+            "render_time_ms": report["render_time_ms"],
+            "duplicates": sum(count - 1 for count in report["duplicates"].values()),
+        }
+        return {
+            key: {"limit": limit, "actual": measured[key]}
+            for key, limit in budget.items()
+            if measured.get(key) is not None and measured[key] > limit
+        }
+
+
+class MetricsMiddleware:
+    """
+    Records request latency, responses by status and, from the report of
+    QueryBudgetMiddleware further in, SQL and template render time plus list
+    cache hits, all labelled by the resolved URL name (see tasks.metrics).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = (("view", match.view_name if match else "<unmatched>"),)
+        registry = get_registry()
+        registry.observe(
+            "http_request_duration_seconds",
+            (("method", request.method), *view),
+            elapsed,
+        )
+        registry.inc(
+            "http_responses_total", (("status", str(response.status_code)), *view)
+        )
+        report = getattr(request, "query_report", None)
+        if report is not None:
+            registry.inc("db_queries_total", view, report["queries"])
+            registry.inc("db_query_seconds_total", view, report["db_time_ms"] / 1000)
+            if report["render_time_ms"] is not None:
+                registry.observe(
+                    "template_render_seconds", view, report["render_time_ms"] / 1000
+                )
+        hit = getattr(request, "list_cache_hit", None)
+        if hit is not None:
+            registry.inc(
+                "list_cache_lookups_total",
+                (("result", "hit" if hit else "miss"), *view),
+            )
+        registry.maybe_flush()
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests tasks.profiling.requested() picks and keeps the
+    results in the PROFILING_DIR ring; the capture id is returned in the
+    ``X-Profile-Id`` header. Without PROFILING_DIR it removes itself.
+    """
+
+    def __init__(self, get_response):
+        self.ring = profiling.get_ring()
+        if self.ring is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        memory = profiling.requested(request)
+        if memory is None:
+            return self.get_response(request)
+        with profiling.Capture(memory) as capture:
+            response = self.get_response(request)
+        response["X-Profile-Id"] = self.ring.save(request, response, capture)
+        return response
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms):
+        self.threshold = threshold_ms / 1000
+        self.samples = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.threshold:
+            caller, template = slow_queries.locate()
+            self.samples.append(
+                slow_queries.Sample(
+                    fingerprint=fingerprint_sql(sql),
+                    sql=sql,
+                    duration_ms=round(elapsed * 1000, 2),
+                    caller=caller,
+                    template=template,
+                    plan=(
+                        ""
+                        if many
+                        else slow_queries.explain(context["connection"], sql, params)
+                    ),
+                )
+            )
+        return result
+
+
+class SlowQueryMiddleware:
+    """
+    Adds every query slower than ``settings.SLOW_QUERY_MS`` to the SlowQuery
+    table once the response is built, with the view, the project source line
+    and the template tag that ran it. Sits outside QueryBudgetMiddleware so
+    its own writes are not counted against the view. Report with
+    ``manage.py slow_queries``.
+    """
+
+    def __init__(self, get_response):
+        self.threshold_ms = getattr(settings, "SLOW_QUERY_MS", None)
+        if self.threshold_ms is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = SlowQueryRecorder(self.threshold_ms)
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        if recorder.samples:
+            match = getattr(request, "resolver_match", None)
+            try:
+                slow_queries.record(recorder.samples, match.view_name if match else "")
+            except DatabaseError:
+                slow_query_logger.exception("Could not record slow queries.")
+        return response
@@ -0,0 +1,58 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+TRIGRAM_INDEXES = [
+    ("Task", "name", "tasks_task_name_trgm"),
+    ("Worker", "username", "tasks_worker_username_trgm"),
+    ("Position", "name", "tasks_position_name_trgm"),
+    ("TaskType", "name", "tasks_tasktype_name_trgm"),
+]
+
+
+def get_indexes(apps):
+    indexes = [
+        (
+            apps.get_model("tasks", model_name),
+            GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=index_name),
+        )
+        for model_name, field, index_name in TRIGRAM_INDEXES
+    ]
+    indexes.append(
+        (
+            apps.get_model("tasks", "Task"),
+            GinIndex(
+                SearchVector("description", config="english"),
+                name="tasks_task_description_fts",
+            ),
+        )
+    )
+    return indexes
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in get_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in get_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_alter_commentary_task_alter_commentary_user"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
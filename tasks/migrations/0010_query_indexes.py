@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["task", "-created_time"], name="comment_task_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="position",
+            index=models.Index(fields=["name", "id"], name="position_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["name", "-deadline", "id"], name="task_name_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "name", "-deadline"], name="task_type_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["deadline"],
+                name="task_open_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasktype",
+            index=models.Index(fields=["name", "id"], name="tasktype_name_idx"),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX task_assignees_worker_task_idx "
+            "ON tasks_task_assignees (worker_id, task_id)",
+            "DROP INDEX task_assignees_worker_task_idx",
+        ),
+    ]
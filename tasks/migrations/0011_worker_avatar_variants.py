@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0010_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="avatar_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
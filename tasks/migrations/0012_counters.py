@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+COUNTERS = [
+    ("Position", "worker_count", "Worker", "position_id"),
+    ("TaskType", "task_count", "Task", "task_type_id"),
+    ("Task", "comment_count", "Commentary", "task_id"),
+]
+
+
+def fill_counters(apps, schema_editor):
+    for owner_name, field, child_name, foreign_key in COUNTERS:
+        children = (
+            apps.get_model("tasks", child_name)
+            .objects.filter(**{foreign_key: OuterRef("pk")})
+            .order_by()
+            .values(foreign_key)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        apps.get_model("tasks", owner_name).objects.update(
+            **{field: Coalesce(Subquery(children), 0)}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0011_worker_avatar_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="position",
+            name="worker_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="comment_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="tasktype",
+            name="task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0012_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_status_deadline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("tasks", "0013_worker_task_history"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_type_name_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "name", "-deadline", "id"],
+                name="task_type_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(
+                fields=["position", "username", "id"], name="worker_position_name_idx"
+            ),
+        ),
+    ]
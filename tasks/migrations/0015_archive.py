@@ -0,0 +1,149 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Least, Now
+
+
+def fill_completed_at(apps, schema_editor):
+    # Completion time was never recorded; the deadline is the best guess.
+    apps.get_model("tasks", "Task").objects.filter(is_completed=True).update(
+        completed_at=Least(F("deadline"), Now())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0014_detail_sublist_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedAssignment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedCommentary",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_time", models.DateTimeField()),
+                ("content", models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=255)),
+                ("description", models.TextField()),
+                ("deadline", models.DateTimeField()),
+                ("is_completed", models.BooleanField(default=True)),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("Urgent", "Urgent"),
+                            ("High", "High"),
+                            ("Medium", "Medium"),
+                            ("Low", "Low"),
+                        ],
+                        default="Medium",
+                        max_length=10,
+                    ),
+                ),
+                ("comment_count", models.IntegerField(default=0)),
+                ("completed_at", models.DateTimeField(null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["name", "-deadline"],
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_completed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", True)),
+                fields=["completed_at", "id"],
+                name="task_completed_at_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedassignment",
+            name="worker",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedcommentary",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_commentaries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="assignees",
+            field=models.ManyToManyField(
+                related_name="archived_tasks",
+                through="tasks.ArchivedAssignment",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="task_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tasks",
+                to="tasks.tasktype",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedcommentary",
+            name="task",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="commentaries",
+                to="tasks.archivedtask",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedassignment",
+            name="task",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="tasks.archivedtask"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="archivedassignment",
+            constraint=models.UniqueConstraint(
+                fields=("task", "worker"), name="archived_assignment_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0015_archive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="commentary",
+            name="comment_task_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["task", "created_time", "id"], name="comment_task_thread_idx"
+            ),
+        ),
+    ]
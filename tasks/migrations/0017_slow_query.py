@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0016_comment_thread_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint_hash", models.CharField(max_length=32, unique=True)),
+                ("fingerprint", models.TextField()),
+                ("sql", models.TextField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                ("view", models.CharField(blank=True, max_length=255)),
+                ("caller", models.CharField(blank=True, max_length=255)),
+                ("template", models.CharField(blank=True, max_length=255)),
+                ("plan", models.TextField(blank=True)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name_plural": "slow queries",
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """LoginRequiredMixin for async views: resolves the user via auser()."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(
+                request.get_full_path(),
+                self.get_login_url(),
+                self.get_redirect_field_name(),
+            )
+        # Templates read request.user; hand them the already loaded user
+        # instead of the lazy object, which would query again.
+        request.user = user
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+class AsyncListMixin:
+    """
+    Async ``get`` for ListView subclasses. The page is fetched with the async
+    ORM up front; context building and rendering then work on that list.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.page_result = await self.apaginate_queryset(
+                self.object_list, page_size
+            )
+        else:
+            self.object_list = [obj async for obj in self.object_list]
+        return self.render_to_response(self.get_context_data())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        parent = super()
+        if hasattr(parent, "apaginate_queryset"):
+            return await parent.apaginate_queryset(queryset, page_size)
+        return await sync_to_async(parent.paginate_queryset)(queryset, page_size)
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.page_result
+
+
+class AsyncDetailMixin:
+    """Async ``get`` for DetailView subclasses looking objects up by pk."""
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        # Views may add related data to the context with the sync ORM.
+        context = await sync_to_async(self.get_context_data)(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.verbose_name} found matching the query"
+            )
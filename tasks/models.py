@@ -1,10 +1,16 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 
 class TaskType(models.Model):
     name = models.CharField(max_length=255)
+    task_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["name", "id"], name="tasktype_name_idx")]
 
     def __str__(self):
         return self.name
@@ -12,9 +18,11 @@ class TaskType(models.Model):
 
 class Position(models.Model):
     name = models.CharField(max_length=255)
+    worker_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["name", "id"], name="position_name_idx")]
 
     def __str__(self):
         return self.name
@@ -25,13 +33,23 @@ class Worker(AbstractUser):
         Position, on_delete=models.CASCADE, related_name="workers", null=False
     )
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ["username"]
+        indexes = [
+            models.Index(
+                fields=["position", "username", "id"], name="worker_position_name_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.username}"
 
+    def avatar_variant_url(self, size, extension="jpg"):
+        name = self.avatar_variants.get(f"{size}.{extension}")
+        return self.avatar.storage.url(name) if name else None
+
 
 class Task(models.Model):
     PRIORITY_CHOICES = [
@@ -54,13 +72,49 @@ class Task(models.Model):
     assignees = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="assigned_tasks"
     )
+    comment_count = models.IntegerField(default=0, editable=False)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["name", "-deadline"]
+        indexes = [
+            models.Index(
+                fields=["name", "-deadline", "id"], name="task_name_deadline_idx"
+            ),
+            models.Index(
+                fields=["task_type", "name", "-deadline", "id"],
+                name="task_type_name_idx",
+            ),
+            models.Index(
+                fields=["deadline"],
+                condition=Q(is_completed=False),
+                name="task_open_deadline_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "deadline", "id"],
+                name="task_status_deadline_idx",
+            ),
+            models.Index(
+                fields=["completed_at", "id"],
+                condition=Q(is_completed=True),
+                name="task_completed_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}"
 
+    def save(self, *args, **kwargs):
+        completed_at = self.completed_at
+        if not self.is_completed:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.completed_at != completed_at:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+
 
 class Commentary(models.Model):
     user = models.ForeignKey(
@@ -70,5 +124,97 @@ class Commentary(models.Model):
     created_time = models.DateTimeField(auto_now_add=True)
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_time", "id"], name="comment_task_thread_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.task} {self.created_time}"
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of the hot tables by tasks.archive. It keeps
+    the original id, so restoring it brings back working links.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=255)
+    description = models.TextField()
+    deadline = models.DateTimeField()
+    is_completed = models.BooleanField(default=True)
+    priority = models.CharField(
+        max_length=10, choices=Task.PRIORITY_CHOICES, default="Medium"
+    )
+    task_type = models.ForeignKey(
+        TaskType, on_delete=models.CASCADE, related_name="archived_tasks"
+    )
+    assignees = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        through="ArchivedAssignment",
+        related_name="archived_tasks",
+    )
+    comment_count = models.IntegerField(default=0)
+    completed_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["name", "-deadline"]
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+class ArchivedAssignment(models.Model):
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE)
+    worker = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "worker"], name="archived_assignment_unique"
+            )
+        ]
+
+
+class ArchivedCommentary(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_commentaries",
+    )
+    task = models.ForeignKey(
+        ArchivedTask, on_delete=models.CASCADE, related_name="commentaries"
+    )
+    created_time = models.DateTimeField()
+    content = models.TextField()
+
     def __str__(self):
         return f"{self.user} {self.task} {self.created_time}"
+
+
+class SlowQuery(models.Model):
+    """One normalized SQL statement that ran over SLOW_QUERY_MS, aggregated."""
+
+    fingerprint_hash = models.CharField(max_length=32, unique=True)
+    fingerprint = models.TextField()
+    sql = models.TextField()
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    view = models.CharField(max_length=255, blank=True)
+    caller = models.CharField(max_length=255, blank=True)
+    template = models.CharField(max_length=255, blank=True)
+    plan = models.TextField(blank=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return self.fingerprint[:80]
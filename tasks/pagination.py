@@ -0,0 +1,325 @@
+import base64
+import binascii
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from tasks.search import is_postgres
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values, backwards=False):
+    payload = json.dumps(
+        {"v": list(values), "b": backwards},
+        default=_json_default,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload["v"]), bool(payload["b"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor(token)
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Seek-based paginator: pages are addressed by the sort key of their
+    boundary rows instead of an OFFSET, and no COUNT(*) is ever issued.
+
+    ``ordering`` must end in a unique column (usually "id") and reference
+    non-nullable fields or annotations of the queryset's model only.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            if name != "pk":
+                return value
+            field = self.queryset.model._meta.pk
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            raise InvalidCursor(value)
+
+    def _key(self, obj):
+        return [getattr(obj, name) for name, _ in self.ordering]
+
+    def cursor_for(self, obj):
+        """Cursor of the page that starts right after ``obj``."""
+        return encode_cursor(self._key(obj))
+
+    def _seek(self, values, backwards):
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def cursor_values(self, cursor):
+        """The sort key ``cursor`` points at, as Python values, and its direction."""
+        values, backwards = decode_cursor(cursor)
+        # The ordering is non-nullable, and None cannot be compared in a seek.
+        if len(values) != len(self.ordering) or None in values:
+            raise InvalidCursor(cursor)
+        values = [
+            self._to_python(name, value)
+            for (name, _), value in zip(self.ordering, values)
+        ]
+        return values, backwards
+
+    def _page_query(self, cursor):
+        backwards = False
+        queryset = self.queryset
+        if cursor:
+            values, backwards = self.cursor_values(cursor)
+            queryset = queryset.filter(self._seek(values, backwards))
+
+        order_by = [
+            f"-{name}" if descending != backwards else name
+            for name, descending in self.ordering
+        ]
+        return queryset.order_by(*order_by)[: self.per_page + 1], backwards
+
+    def _build_page(self, rows, cursor, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = encode_cursor(self._key(rows[-1]))
+            if (has_more and backwards) or (cursor and not backwards):
+                previous_cursor = encode_cursor(self._key(rows[0]), backwards=True)
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        queryset, backwards = self._page_query(cursor)
+        return self._build_page(list(queryset), cursor, backwards)
+
+    async def apage(self, cursor=None):
+        queryset, backwards = self._page_query(cursor)
+        return self._build_page([obj async for obj in queryset], cursor, backwards)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    OFFSET paginator that avoids an exact COUNT(*) on large PostgreSQL
+    tables. Unfiltered querysets read ``pg_class.reltuples``; filtered ones
+    use the planner's row estimate. Exact counts are still taken whenever
+    the estimate is below ``exact_count_cap`` and on other databases.
+    ``count_is_estimated`` tells templates to say "about N".
+    """
+
+    exact_count_cap = 10_000
+    count_is_estimated = False
+
+    def _is_unfiltered(self, query):
+        return (
+            not query.where
+            and not query.distinct
+            and query.group_by is None
+            and not query.combinator
+            and not query.is_sliced
+        )
+
+    def _table_estimate(self, queryset):
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table is first vacuumed or analyzed.
+        return row[0] if row and row[0] >= 0 else None
+
+    def _plan_estimate(self, queryset):
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
+    def estimate(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query") or not is_postgres(queryset):
+            return None
+        if self._is_unfiltered(queryset.query):
+            return self._table_estimate(queryset)
+        return self._plan_estimate(queryset)
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate()
+        if estimate is None or estimate < self.exact_count_cap:
+            return super().count
+        self.count_is_estimated = True
+        return int(estimate)
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # An estimate can undershoot; past its last page, ask the table.
+            number = int(number)
+            if self.count_is_estimated and number > 1 and self.page_has_rows(number):
+                return number
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimated:
+            return super().page(number)
+        # Paginator.page() would clip the slice at the estimated count.
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
+    def page_has_rows(self, number):
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom : bottom + 1].exists()
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin switching pagination to ``KeysetPaginator`` whenever the
+    view declares ``keyset_ordering``. An explicit ``?page=`` keeps the
+    classic OFFSET paginator so old links still resolve.
+    """
+
+    keyset_ordering = None
+    cursor_kwarg = "cursor"
+
+    def get_keyset_ordering(self):
+        return self.keyset_ordering
+
+    def uses_keyset(self):
+        return self.get_keyset_ordering() is not None and (
+            self.page_kwarg not in self.request.GET
+            or self.cursor_kwarg in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_keyset():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.get_keyset_ordering())
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if not self.uses_keyset():
+            return await sync_to_async(super().paginate_queryset)(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.get_keyset_ordering())
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class KeysetSubListMixin:
+    """
+    DetailView mixin paging one child collection of the object with
+    ``KeysetPaginator``. The page is exposed as ``page_obj`` so the shared
+    pagination include renders it like a list view's.
+
+    The collection is ``sublist_related_name`` on the object, e.g. "workers";
+    override ``get_sublist_queryset`` to narrow it.
+    """
+
+    paginate_by = 10
+    sublist_related_name = None
+    sublist_ordering = None
+    cursor_kwarg = "cursor"
+
+    def get_sublist_queryset(self):
+        if self.sublist_related_name is None:
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} is missing a sublist_related_name. "
+                "Define it or override get_sublist_queryset()."
+            )
+        return getattr(self.object, self.sublist_related_name).all()
+
+    def get_sublist_page(self):
+        paginator = KeysetPaginator(
+            self.get_sublist_queryset(), self.paginate_by, self.sublist_ordering
+        )
+        try:
+            return paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = self.get_sublist_page()
+        context["page_obj"] = page
+        context["is_paginated"] = page.has_other_pages()
+        return context
@@ -0,0 +1,185 @@
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+PROFILE_NAME = re.compile(r"^[\w-]+\.(prof|json)$")
+
+# How many captures are tracing allocations, and whether the first of them
+# started tracemalloc (in which case the last one stops it).
+_tracing_lock = threading.Lock()
+_tracing_captures = 0
+_tracing_started = False
+
+
+def requested(request):
+    """
+    Whether to profile ``request``: None for no, otherwise whether to take
+    an allocation snapshot as well. ``X-Profile: <PROFILING_TOKEN>`` asks for
+    one request (plus ``X-Profile-Memory: 1`` for allocations); otherwise
+    ``PROFILING_SAMPLE_RATE`` of requests are picked at random.
+    """
+    token = getattr(settings, "PROFILING_TOKEN", None)
+    header = request.headers.get("X-Profile")
+    if token and header and hmac.compare_digest(header, token):
+        return request.headers.get("X-Profile-Memory") == "1"
+    rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0)
+    if rate and random.random() < rate:
+        return getattr(settings, "PROFILING_TRACEMALLOC", False)
+    return None
+
+
+def start_tracing():
+    global _tracing_captures, _tracing_started
+    with _tracing_lock:
+        if not _tracing_captures:
+            _tracing_started = not tracemalloc.is_tracing()
+            if _tracing_started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _tracing_captures += 1
+
+
+def stop_tracing():
+    """A snapshot and the peak so far; tracing stops with the last capture."""
+    global _tracing_captures
+    with _tracing_lock:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracing_captures -= 1
+        if not _tracing_captures and _tracing_started:
+            tracemalloc.stop()
+    return snapshot, peak
+
+
+class Capture:
+    """
+    cProfile (and optionally tracemalloc) around one request. cProfile only
+    sees the current thread; under ASGI that is the thread that runs the
+    middleware and, through sync_to_async, the ORM calls and rendering of
+    the async views. tracemalloc is process wide, so allocations of requests
+    served at the same time are included, and overlapping captures share
+    one trace: the peak of each is measured from the first one's start.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.profiler = cProfile.Profile()
+        self.snapshot = None
+        self.peak = None
+
+    def __enter__(self):
+        self.started = timezone.now()
+        if self.memory:
+            start_tracing()
+        self.clock = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.clock
+        if self.memory:
+            self.snapshot, self.peak = stop_tracing()
+
+    def functions(self, limit=30):
+        stats = pstats.Stats(self.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for function, (_, calls, total, cumulative, _) in rows[:limit]
+        ]
+
+    def allocations(self, limit=30):
+        if self.snapshot is None:
+            return None
+        top = self.snapshot.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        ).statistics("lineno")[:limit]
+        return {
+            "peak_kib": round(self.peak / 1024, 1),
+            "top": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_kib": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in top
+            ],
+        }
+
+
+class ProfileRing:
+    """
+    The newest ``keep`` captures in ``directory``, each as ``<id>.prof``
+    (pstats, for snakeviz or ``python -m pstats``) and ``<id>.json`` (the
+    request, the slowest functions and the allocation summary).
+    """
+
+    def __init__(self, directory, keep=50):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def save(self, request, response, capture):
+        match = getattr(request, "resolver_match", None)
+        name = f"{capture.started:%Y%m%dT%H%M%S%f}-{os.getpid()}"
+        capture.profiler.dump_stats(self.directory / f"{name}.prof")
+        summary = {
+            "id": name,
+            "started": capture.started.isoformat(),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(capture.duration * 1000, 2),
+            "functions": capture.functions(),
+            "memory": capture.allocations(),
+        }
+        (self.directory / f"{name}.json").write_text(json.dumps(summary, indent=2))
+        self.prune()
+        return name
+
+    def prune(self):
+        for path in sorted(self.directory.glob("*.json"))[: -self.keep]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def entries(self):
+        """Summaries of the kept captures, newest first."""
+        entries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                entries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Pruned or still being written by another worker.
+                continue
+        return entries
+
+    def path(self, filename):
+        if not PROFILE_NAME.match(filename):
+            return None
+        path = self.directory / filename
+        return path if path.is_file() else None
+
+
+def get_ring():
+    directory = getattr(settings, "PROFILING_DIR", None)
+    if not directory:
+        return None
+    return ProfileRing(directory, getattr(settings, "PROFILING_KEEP", 50))
@@ -0,0 +1,35 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F
+
+FULL_TEXT_CONFIG = "english"
+
+
+def is_postgres(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_contains(queryset, field, term):
+    # On PostgreSQL the UPPER(...) gin_trgm_ops indexes from migration 0009
+    # match the SQL Django emits for icontains, so the leading-wildcard
+    # LIKE becomes a bitmap index scan. SQLite simply scans.
+    term = (term or "").strip()
+    if not term:
+        return queryset
+    return queryset.filter(**{f"{field}__icontains": term})
+
+
+def search_tasks_full_text(queryset, term):
+    term = (term or "").strip()
+    if not term:
+        return queryset
+    if not is_postgres(queryset):
+        return queryset.filter(description__icontains=term)
+
+    query = SearchQuery(term, config=FULL_TEXT_CONFIG, search_type="websearch")
+    return (
+        queryset.alias(document=SearchVector("description", config=FULL_TEXT_CONFIG))
+        .filter(document=query)
+        .annotate(rank=SearchRank(F("document"), query))
+        .order_by("-rank", "id")
+    )
@@ -0,0 +1,135 @@
+import hashlib
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.template.base import Node
+from django.utils import timezone
+
+from tasks.models import SlowQuery
+
+PROJECT_DIR = Path(settings.BASE_DIR).resolve()
+SKIPPED_CALLERS = {
+    str(Path(__file__).resolve()),
+    str(PROJECT_DIR / "tasks" / "middleware.py"),
+}
+
+
+@dataclass
+class Sample:
+    fingerprint: str
+    sql: str
+    duration_ms: float
+    caller: str = ""
+    template: str = ""
+    plan: str = ""
+
+
+def locate():
+    """
+    The innermost project source line and template tag on the current stack,
+    e.g. ``("tasks/views.py:120 in get_queryset", "tasks/task_list.html:14")``.
+    """
+    caller = template = ""
+    frame = sys._getframe(1)
+    while frame is not None and not (caller and template):
+        code = frame.f_code
+        if not caller:
+            path = Path(code.co_filename)
+            if (
+                path.is_relative_to(PROJECT_DIR)
+                and str(path) not in SKIPPED_CALLERS
+                and "site-packages" not in path.parts
+            ):
+                caller = (
+                    f"{path.relative_to(PROJECT_DIR)}:{frame.f_lineno} "
+                    f"in {code.co_name}"
+                )
+        if not template:
+            node = frame.f_locals.get("self")
+            # type(), not isinstance(): the latter reads __class__, which
+            # would evaluate a lazy object (and maybe run another query).
+            if issubclass(type(node), Node) and getattr(node, "token", None):
+                name = node.origin.template_name or node.origin.name
+                template = f"{name}:{node.token.lineno}"
+        frame = frame.f_back
+    return caller, template
+
+
+def explain(connection, sql, params):
+    """
+    EXPLAIN (ANALYZE, BUFFERS) of a SELECT on PostgreSQL, run on a raw cursor
+    so no execute wrapper sees it. ANALYZE runs the query again, so only a
+    sample of slow queries is explained, and none inside a transaction, where
+    a failure would abort the caller's work.
+    """
+    rate = getattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0)
+    if (
+        not rate
+        or random.random() >= rate
+        or connection.vendor != "postgresql"
+        or connection.in_atomic_block
+        or not sql.lstrip().upper().startswith("SELECT")
+    ):
+        return ""
+    try:
+        with connection.connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+            return "\n".join(row[0] for row in cursor.fetchall())
+    except DatabaseError:
+        return ""
+
+
+def fingerprint_hash(fingerprint):
+    return hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+
+
+def record(samples, view):
+    """Add ``samples`` to the SlowQuery table, one upsert per fingerprint."""
+    by_fingerprint = {}
+    for sample in samples:
+        by_fingerprint.setdefault(sample.fingerprint, []).append(sample)
+    now = timezone.now()
+    for fingerprint, group in by_fingerprint.items():
+        latest = group[-1]
+        plan = next((s.plan for s in reversed(group) if s.plan), "")
+        values = {
+            "sql": latest.sql,
+            "view": view,
+            "caller": latest.caller[:255],
+            "template": latest.template[:255],
+            "last_seen": now,
+            **({"plan": plan} if plan else {}),
+        }
+        total = sum(sample.duration_ms for sample in group)
+        longest = max(sample.duration_ms for sample in group)
+        key = fingerprint_hash(fingerprint)
+        if add(key, len(group), total, longest, values):
+            continue
+        try:
+            with transaction.atomic():
+                SlowQuery.objects.create(
+                    fingerprint_hash=key,
+                    fingerprint=fingerprint,
+                    count=len(group),
+                    total_ms=total,
+                    max_ms=longest,
+                    **values,
+                )
+        except IntegrityError:
+            # Another worker created it first; add to its row instead.
+            add(key, len(group), total, longest, values)
+
+
+def add(key, count, total_ms, max_ms, values):
+    return SlowQuery.objects.filter(fingerprint_hash=key).update(
+        count=F("count") + count,
+        total_ms=F("total_ms") + total_ms,
+        max_ms=Greatest("max_ms", max_ms),
+        **values,
+    )
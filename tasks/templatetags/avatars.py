@@ -0,0 +1,49 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar(worker, size=110, css_class="rounded-circle shadow", alt=""):
+    size = int(size)
+    if not worker.avatar:
+        return format_html(
+            '<img src="{}" width="{}" height="{}" class="{}" alt="{}">',
+            static("images/user.jpg"),
+            size,
+            size,
+            css_class,
+            alt,
+        )
+
+    jpg_1x = worker.avatar_variant_url(size)
+    if jpg_1x is None:
+        # Variants not generated yet (see the backfill_avatars command).
+        return format_html(
+            '<img src="{}" width="{}" height="{}" class="{}" alt="{}">',
+            worker.avatar.url,
+            size,
+            size,
+            css_class,
+            alt,
+        )
+
+    jpg_2x = worker.avatar_variant_url(size * 2) or jpg_1x
+    webp_1x = worker.avatar_variant_url(size, "webp")
+    webp_2x = worker.avatar_variant_url(size * 2, "webp") or webp_1x
+    return format_html(
+        '<picture><source type="image/webp" srcset="{} 1x, {} 2x">'
+        '<img src="{}" srcset="{} 1x, {} 2x" width="{}" height="{}" '
+        'class="{}" alt="{}" loading="lazy"></picture>',
+        webp_1x,
+        webp_2x,
+        jpg_1x,
+        jpg_1x,
+        jpg_2x,
+        size,
+        size,
+        css_class,
+        alt,
+    )
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from tasks.models import TaskType, Position, Worker, Task
@@ -51,3 +53,57 @@ class AdminSiteTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+    def test_task_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse("admin:tasks_task_changelist")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for index in range(10):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="",
+                deadline=timezone.now(),
+                task_type=TaskType.objects.create(name=f"Type {index}"),
+            )
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertContains(response, "Type 9")
+        self.assertEqual(len(few), len(many))
+
+    def test_deadline_filter(self):
+        Task.objects.create(
+            name="Later",
+            description="",
+            deadline=timezone.now() + timezone.timedelta(days=60),
+            task_type=self.task_type,
+        )
+        url = reverse("admin:tasks_task_changelist")
+        response = self.client.get(url, {"deadline": "later"})
+        self.assertContains(response, "Later")
+        self.assertNotContains(response, "Fix issue")
+
+    def test_bulk_actions_run_one_update(self):
+        url = reverse("admin:tasks_task_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                url,
+                {"action": "mark_completed", "_selected_action": [self.task.pk]},
+            )
+        self.assertEqual(len([q for q in queries if q["sql"].startswith("UPDATE")]), 1)
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.is_completed)
+
+    def test_autocomplete(self):
+        response = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": "Bu",
+                "app_label": "tasks",
+                "model_name": "task",
+                "field_name": "task_type",
+            },
+        )
+        self.assertEqual(
+            [result["text"] for result in response.json()["results"]], ["Bug"]
+        )
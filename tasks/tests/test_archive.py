@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import (
+    ArchivedTask,
+    Commentary,
+    Position,
+    Task,
+    TaskType,
+    Worker,
+)
+
+
+class ArchiveTest(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        now = timezone.now()
+        self.old, self.recent, self.open = [
+            Task.objects.create(
+                name=name,
+                description="",
+                deadline=now,
+                is_completed=completed,
+                task_type=self.task_type,
+            )
+            for name, completed in (("old", True), ("recent", True), ("open", False))
+        ]
+        Task.objects.filter(pk=self.old.pk).update(
+            completed_at=now - timedelta(days=400)
+        )
+        self.old.assignees.add(self.worker)
+        self.comment = Commentary.objects.create(
+            user=self.worker, task=self.old, content="Done"
+        )
+        Commentary.objects.filter(pk=self.comment.pk).update(
+            created_time=now - timedelta(days=500)
+        )
+        self.comment.refresh_from_db()
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command("archive_tasks", days=180, stdout=out, **options)
+        return out.getvalue()
+
+    def test_save_tracks_completion_time(self):
+        self.assertIsNotNone(self.recent.completed_at)
+        self.assertIsNone(self.open.completed_at)
+        self.recent.is_completed = False
+        self.recent.save(update_fields=["is_completed"])
+        self.recent.refresh_from_db()
+        self.assertIsNone(self.recent.completed_at)
+
+    def test_archive_and_restore_round_trip(self):
+        self.assertIn("1 tasks would be archived", self.archive(dry_run=True))
+        self.assertEqual(Task.objects.count(), 3)
+
+        output = self.archive(batch_size=1)
+        self.assertIn("Archived 1 tasks, 1 comments, 1 assignments", output)
+        self.assertFalse(Task.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Commentary.objects.exists())
+        archived = ArchivedTask.objects.get(pk=self.old.pk)
+        self.assertEqual(list(archived.assignees.all()), [self.worker])
+        self.task_type.refresh_from_db()
+        self.assertEqual(self.task_type.task_count, 2)
+
+        out = StringIO()
+        call_command("restore_tasks", self.old.pk, stdout=out)
+        self.assertIn("Restored 1 tasks, 1 comments, 1 assignments", out.getvalue())
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertEqual(list(self.old.assignees.all()), [self.worker])
+        self.assertEqual(
+            Commentary.objects.get().created_time, self.comment.created_time
+        )
+        self.task_type.refresh_from_db()
+        self.assertEqual(self.task_type.task_count, 3)
+        self.assertIn("All counters are correct", run_reconcile())
+
+    def test_task_list_hides_archived_unless_asked(self):
+        self.archive()
+        self.client.force_login(self.worker)
+        url = reverse("tasks:task-list")
+        response = self.client.get(url)
+        self.assertEqual(
+            [task.name for task in response.context["task_list"]], ["open", "recent"]
+        )
+        response = self.client.get(url, {"archived": "on"})
+        self.assertEqual(
+            [
+                (row["name"], row["is_archived"])
+                for row in response.context["task_list"]
+            ],
+            [("old", True), ("open", False), ("recent", False)],
+        )
+        self.assertContains(response, "archived</span>")
+
+
+def run_reconcile():
+    out = StringIO()
+    call_command("reconcile_counters", dry_run=True, stdout=out)
+    return out.getvalue()
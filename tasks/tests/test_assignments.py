@@ -0,0 +1,98 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.assignments import apply, assignments_changed
+from tasks.models import Position, Task, TaskType, Worker
+
+
+class AssignmentsTest(TestCase):
+    def setUp(self):
+        position = Position.objects.create(name="Developer")
+        self.user = Worker.objects.create_user(username="user", position=position)
+        self.other = Worker.objects.create_user(username="other", position=position)
+        task_type = TaskType.objects.create(name="Bug")
+        self.first, self.second = [
+            Task.objects.create(
+                name=name, description="", deadline=timezone.now(), task_type=task_type
+            )
+            for name in ("first", "second")
+        ]
+        self.client.force_login(self.user)
+        self.url = reverse("tasks:assignments")
+
+    def post(self, payload):
+        return self.client.post(
+            self.url, json.dumps(payload), content_type="application/json"
+        )
+
+    def test_apply_is_idempotent_and_notifies_once(self):
+        calls = []
+
+        def receiver(**kwargs):
+            calls.append(kwargs["task_ids"])
+
+        assignments_changed.connect(receiver)
+        self.addCleanup(assignments_changed.disconnect, receiver)
+
+        pairs = [(self.first.pk, self.user.pk), (self.second.pk, self.user.pk)]
+        with self.assertNumQueries(6):
+            result = apply(assign=pairs)
+        self.assertEqual(
+            result, {self.first.pk: [self.user.pk], self.second.pk: [self.user.pk]}
+        )
+        self.assertEqual(apply(assign=pairs), result)
+        self.assertEqual(calls, [{self.first.pk, self.second.pk}] * 2)
+
+        result = apply(
+            assign=[(self.first.pk, self.other.pk)],
+            unassign=[(self.second.pk, self.user.pk)],
+        )
+        self.assertEqual(
+            result,
+            {self.first.pk: [self.user.pk, self.other.pk], self.second.pk: []},
+        )
+
+    def test_endpoint(self):
+        response = self.post(
+            {"assign": [{"task": self.first.pk}, {"task": self.second.pk}]}
+        )
+        self.assertEqual(
+            response.json(),
+            {
+                "tasks": {
+                    str(self.first.pk): [self.user.pk],
+                    str(self.second.pk): [self.user.pk],
+                }
+            },
+        )
+        response = self.post({"unassign": [{"task": self.first.pk}]})
+        self.assertEqual(response.json(), {"tasks": {str(self.first.pk): []}})
+
+    def test_endpoint_rejects_bad_requests(self):
+        self.assertEqual(self.post([1, 2]).status_code, 400)
+        self.assertEqual(self.post({"assign": [{"task": "x"}]}).status_code, 400)
+        response = self.post({"assign": [{"task": 0}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown task ids: 0", response.json()["error"])
+        response = self.post(
+            {
+                "assign": [{"task": self.first.pk}],
+                "unassign": [{"task": self.first.pk}],
+            }
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post(
+            {"assign": [{"task": self.first.pk, "worker": self.other.pk}]}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.post(
+            {"assign": [{"task": self.first.pk, "worker": self.other.pk}]}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.first.assignees.all()), [self.other])
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from tasks.management.commands.benchmark_concurrency import (
+    async_routes,
+    sync_urlconf,
+    sync_view_class,
+)
+from tasks.models import Commentary, Position, Task, TaskType, Worker
+from tasks.views import TaskEventsView, TaskListView
+
+
+class AsyncViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        task_type = TaskType.objects.create(name="Bug")
+        cls.tasks = Task.objects.bulk_create(
+            Task(name=f"Task {i}", deadline=timezone.now(), task_type=task_type)
+            for i in range(7)
+        )
+
+    async def test_anonymous_is_redirected_to_login(self):
+        response = await self.async_client.get(reverse("tasks:task-list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("login"), response.url)
+
+    async def test_list_pages_with_cursor(self):
+        await self.async_client.aforce_login(self.worker)
+        response = await self.async_client.get(reverse("tasks:task-list"))
+        self.assertEqual(response.status_code, 200)
+        page = response.context["page_obj"]
+        self.assertEqual(len(page.object_list), 5)
+
+        response = await self.async_client.get(
+            reverse("tasks:task-list"), {"cursor": page.next_cursor}
+        )
+        self.assertEqual(
+            [task.name for task in response.context["task_list"]],
+            ["Task 5", "Task 6"],
+        )
+
+    async def test_detail_views(self):
+        await self.async_client.aforce_login(self.worker)
+        url = reverse("tasks:worker-detail", kwargs={"pk": self.worker.pk})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.context["worker"], self.worker)
+        self.assertContains(response, "worker")
+
+        url = reverse("tasks:task-detail", kwargs={"pk": 0})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_comment_list_and_post(self):
+        await self.async_client.aforce_login(self.worker)
+        url = reverse("tasks:comment-list", kwargs={"pk": self.tasks[0].pk})
+        response = await self.async_client.post(url, {"content": "Async comment"})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response.context["task"].comment_count, 1)
+        self.assertContains(response, "Async comment")
+        comment = await Commentary.objects.aget()
+        self.assertEqual(comment.user_id, self.worker.pk)
+
+    def test_read_views_are_async(self):
+        view = resolve(reverse("tasks:task-list")).func
+        self.assertTrue(view.view_class.view_is_async)
+        view = resolve(reverse("tasks:task-list"), urlconf=sync_urlconf()).func
+        self.assertIs(view.view_class, TaskListView)
+
+    def test_benchmark_leaves_out_routes_without_a_sync_view(self):
+        self.assertIsNone(sync_view_class(TaskEventsView))
+        names = {pattern.name for pattern in async_routes()}
+        self.assertIn("comment-since", names)
+        self.assertNotIn("task-events", names)
@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from tasks.forms import AvatarForm
+from tasks.models import Position, Worker
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_upload(width=600, height=400, name="photo.jpg"):
+    with open("static/images/user.jpg", "rb") as f:
+        image = Image.open(f).resize((width, height))
+    upload = SimpleUploadedFile(name, b"", content_type="image/jpeg")
+    image.save(upload.file, "JPEG")
+    upload.file.seek(0)
+    upload.size = upload.file.getbuffer().nbytes
+    return upload
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AvatarVariantsTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+
+    def upload(self, **kwargs):
+        form = AvatarForm(
+            data={}, files={"avatar": image_upload(**kwargs)}, instance=self.worker
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def test_upload_generates_square_variants(self):
+        worker = self.upload()
+        self.assertEqual(
+            set(worker.avatar_variants), {"110.jpg", "110.webp", "220.jpg", "220.webp"}
+        )
+        storage = worker.avatar.storage
+        with storage.open(worker.avatar_variants["220.webp"]) as f:
+            image = Image.open(f)
+            self.assertEqual((image.format, image.size), ("WEBP", (220, 220)))
+        self.assertTrue(
+            worker.avatar_variants["110.jpg"].startswith(worker.avatar.name[:-4])
+        )
+
+    @override_settings(AVATAR_MAX_PIXELS=1000)
+    def test_rejects_oversized_images(self):
+        form = AvatarForm(
+            data={}, files={"avatar": image_upload()}, instance=self.worker
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("avatar", form.errors)
+
+    def test_template_tag_emits_srcset(self):
+        template = Template("{% load avatars %}{% avatar worker 110 %}")
+        fallback = template.render(Context({"worker": self.worker}))
+        self.assertIn("images/user.jpg", fallback)
+
+        worker = self.upload()
+        html = template.render(Context({"worker": worker}))
+        self.assertIn('type="image/webp"', html)
+        self.assertIn(f"{worker.avatar_variant_url(220)} 2x", html)
+        self.assertIn('width="110"', html)
+
+    def test_backfill_command(self):
+        self.worker.avatar = image_upload()
+        self.worker.save()
+        self.assertEqual(self.worker.avatar_variants, {})
+
+        out = StringIO()
+        call_command("backfill_avatars", stdout=out)
+        self.worker.refresh_from_db()
+        self.assertEqual(len(self.worker.avatar_variants), 4)
+        self.assertIn("for 1 workers", out.getvalue())
+
+    def test_worker_list_renders_variants(self):
+        self.upload()
+        client = Client()
+        client.force_login(self.worker)
+        response = client.get(reverse("tasks:worker-list"))
+        self.assertContains(response, "_220.webp 2x")
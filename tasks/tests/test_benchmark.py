@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from tasks.models import Position, TaskType, Worker, Task, Commentary
+
+
+class GenerateDataTest(TestCase):
+    def generate(self, **options):
+        call_command(
+            "generate_data",
+            positions=3,
+            task_types=2,
+            workers=10,
+            tasks=40,
+            comments=100,
+            max_assignees=3,
+            seed=7,
+            batch_size=16,
+            stdout=StringIO(),
+            **options,
+        )
+
+    def test_creates_requested_volumes(self):
+        self.generate()
+        self.assertEqual(Position.objects.count(), 3)
+        self.assertEqual(TaskType.objects.count(), 2)
+        self.assertEqual(Worker.objects.count(), 10)
+        self.assertEqual(Task.objects.count(), 40)
+        self.assertEqual(Commentary.objects.count(), 100)
+        self.assertGreater(Task.assignees.through.objects.count(), 0)
+        self.assertGreater(
+            Commentary.objects.values("created_time").distinct().count(), 1
+        )
+
+    def test_seed_is_reproducible(self):
+        self.generate()
+        first = list(Task.objects.order_by("pk").values_list("name", "priority"))
+        Task.objects.all().delete()
+        self.generate()
+        second = list(Task.objects.order_by("pk").values_list("name", "priority"))
+        self.assertEqual(first, second)
+
+
+class BenchmarkViewsTest(TestCase):
+    def test_reports_every_route(self):
+        call_command(
+            "generate_data",
+            workers=3,
+            tasks=5,
+            comments=5,
+            seed=1,
+            stdout=StringIO(),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            call_command("benchmark_views", requests=2, output=path, stdout=StringIO())
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+
+            out = StringIO()
+            call_command("benchmark_views", requests=1, compare=path, stdout=out)
+
+        self.assertEqual(results["task-list"]["status"], 200)
+        self.assertIn("p95_ms", results["task-detail"])
+        self.assertNotIn("comment-delete", results)
+        self.assertIn("queries +", out.getvalue())
+
+
+class BenchmarkConcurrencyTest(TransactionTestCase):
+    def test_reports_every_async_route(self):
+        call_command(
+            "generate_data",
+            workers=3,
+            tasks=5,
+            comments=5,
+            seed=1,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command("benchmark_concurrency", requests=2, concurrency=2, stdout=out)
+        self.assertIn("comment-since", out.getvalue())
+        self.assertIn("task-list", out.getvalue())
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from tasks.models import Task, TaskType, Position, Commentary
+from tasks.pagination import encode_cursor
 from django.utils import timezone
 
 
@@ -76,3 +79,75 @@ class CommentViewsTest(TestCase):
         self.assertEqual(response.status_code, 403)
 
         self.assertTrue(Commentary.objects.filter(id=self.comment1.id).exists())
+
+    def test_comment_thread_uses_cursor(self):
+        for index in range(6):
+            Commentary.objects.create(
+                content=f"Reply {index}", user=self.user, task=self.task
+            )
+        url = reverse("tasks:comment-list", args=[self.task.id])
+        response = self.client.get(url)
+        page = response.context["page_obj"]
+        self.assertTrue(page.is_keyset)
+        self.assertEqual(page[0].content, "Reply 5")
+        self.assertTrue(response.context["follow_new_comments"])
+
+        response = self.client.get(url, {"cursor": page.next_cursor})
+        self.assertEqual(
+            [c.content for c in response.context["page_obj"]],
+            ["Reply 0", "Second comment", "First comment"],
+        )
+        self.assertNotIn("follow_new_comments", response.context)
+
+    def test_comments_since_cursor(self):
+        url = reverse("tasks:comment-list", args=[self.task.id])
+        since_url = reverse("tasks:comment-since", args=[self.task.id])
+        Commentary.objects.update(created_time=timezone.now() - timedelta(hours=1))
+        cursor = self.client.get(url).context["since_cursor"]
+
+        # Nothing new; only the overlap before the cursor is repeated.
+        data = self.client.get(since_url, {"cursor": cursor}).json()
+        self.assertEqual(
+            [c["id"] for c in data["comments"]], [self.comment1.id, self.comment2.id]
+        )
+        self.assertEqual(data["cursor"], cursor)
+
+        Commentary.objects.create(content="Newer", user=self.user, task=self.task)
+        with self.assertNumQueries(4):
+            data = self.client.get(since_url, {"cursor": cursor}).json()
+        self.assertEqual(
+            [c["content"] for c in data["comments"]],
+            ["First comment", "Second comment", "Newer"],
+        )
+        self.assertIn("data-comment-id", data["html"])
+        self.assertFalse(data["has_more"])
+        for cursor in ("x", encode_cursor([None, None])):
+            response = self.client.get(since_url, {"cursor": cursor})
+            self.assertEqual(response.status_code, 404)
+
+    def test_comments_since_cursor_repeats_the_overlap(self):
+        since_url = reverse("tasks:comment-since", args=[self.task.id])
+        Commentary.objects.update(created_time=timezone.now() - timedelta(hours=1))
+        newer = Commentary.objects.create(
+            content="Newer", user=self.user, task=self.task
+        )
+        cursor = self.client.get(since_url).json()["cursor"]
+
+        # Stamped before "Newer" but committed after the poll that passed it.
+        late = Commentary.objects.create(content="Late", user=self.user, task=self.task)
+        Commentary.objects.filter(pk=late.pk).update(
+            created_time=newer.created_time - timedelta(seconds=1)
+        )
+        data = self.client.get(since_url, {"cursor": cursor}).json()
+        self.assertEqual([c["content"] for c in data["comments"]], ["Late", "Newer"])
+        self.assertEqual(data["cursor"], cursor)
+
+    def test_scripted_post_returns_only_the_new_comment(self):
+        response = self.client.post(
+            reverse("tasks:comment-list", args=[self.task.id]),
+            {"content": "Fragment reply"},
+            headers={"X-Requested-With": "XMLHttpRequest"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertContains(response, "Fragment reply", status_code=201)
+        self.assertNotContains(response, "First comment", status_code=201)
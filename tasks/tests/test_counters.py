@@ -0,0 +1,121 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Commentary, Position, Task, TaskType, Worker
+
+
+class CountersTest(TestCase):
+    def setUp(self):
+        self.developers = Position.objects.create(name="Developer")
+        self.testers = Position.objects.create(name="Tester")
+        self.bug = TaskType.objects.create(name="Bug")
+        self.worker = Worker.objects.create_user(
+            username="worker", position=self.developers
+        )
+        self.task = Task.objects.create(
+            name="Fix", description="", deadline=timezone.now(), task_type=self.bug
+        )
+
+    def assertCounts(self, developers, testers, tasks, comments):
+        self.developers.refresh_from_db()
+        self.testers.refresh_from_db()
+        self.bug.refresh_from_db()
+        self.task.refresh_from_db()
+        self.assertEqual(
+            (
+                self.developers.worker_count,
+                self.testers.worker_count,
+                self.bug.task_count,
+                self.task.comment_count,
+            ),
+            (developers, testers, tasks, comments),
+        )
+
+    def test_create_reassign_and_delete(self):
+        comment = Commentary.objects.create(
+            user=self.worker, task=self.task, content="Hi"
+        )
+        self.assertCounts(1, 0, 1, 1)
+
+        self.worker.position = self.testers
+        self.worker.save()
+        self.assertCounts(0, 1, 1, 1)
+
+        self.worker.last_name = "Smith"
+        self.worker.save(update_fields=["last_name"])
+        comment.delete()
+        self.assertCounts(0, 1, 1, 0)
+
+    def test_queryset_and_cascade_deletes(self):
+        Commentary.objects.create(user=self.worker, task=self.task, content="Hi")
+        Worker.objects.create_user(username="other", position=self.developers)
+        Worker.objects.filter(username="other").delete()
+        self.assertCounts(1, 0, 1, 1)
+
+        # Deleting the worker cascades to their comments.
+        self.worker.delete()
+        self.assertCounts(0, 0, 1, 0)
+
+    def test_cascade_updates_each_owner_once(self):
+        other = Task.objects.create(
+            name="Other", description="", deadline=timezone.now(), task_type=self.bug
+        )
+        Commentary.objects.bulk_create(
+            Commentary(user=self.worker, task=task, content="Hi")
+            for task in (self.task, self.task, self.task, other)
+        )
+        Task.objects.filter(pk__in=[self.task.pk, other.pk]).update(comment_count=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.worker.delete()
+        updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "tasks_task"')
+        ]
+        # One UPDATE per distinct delta: -3 for self.task, -1 for other.
+        self.assertEqual(len(updates), 2)
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 2)
+        self.assertCounts(0, 0, 2, 0)
+
+    def test_list_views_read_stored_counters(self):
+        self.client.force_login(self.worker)
+        Position.objects.filter(pk=self.developers.pk).update(worker_count=42)
+        response = self.client.get(reverse("tasks:position-list"))
+        self.assertContains(response, "42 workers")
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        Task.objects.filter(pk=self.task.pk).update(comment_count=5)
+        Position.objects.filter(pk=self.testers.pk).update(worker_count=-1)
+
+        out = StringIO()
+        call_command("reconcile_counters", dry_run=True, verbosity=2, stdout=out)
+        self.assertIn("stored 5, actual 0", out.getvalue())
+        self.assertIn("2 counters have drifted", out.getvalue())
+        self.assertCounts(1, -1, 1, 5)
+
+        call_command("reconcile_counters", batch_size=1, stdout=StringIO())
+        self.assertCounts(1, 0, 1, 0)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertIn("All counters are correct", out.getvalue())
+
+    def test_generate_data_leaves_counters_correct(self):
+        call_command(
+            "generate_data",
+            workers=5,
+            tasks=10,
+            comments=30,
+            seed=3,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command("reconcile_counters", dry_run=True, stdout=out)
+        self.assertIn("All counters are correct", out.getvalue())
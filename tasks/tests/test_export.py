@@ -0,0 +1,78 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from tasks.models import Task, TaskType, Position, Worker, Commentary
+
+
+class ExportDataTests:
+    jobs = 1
+
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.worker = Worker.objects.create_user(
+            username="worker", position=self.position
+        )
+        self.task = Task.objects.create(
+            name="Fix issue",
+            description="Fix the reported issue",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        self.task.assignees.add(self.worker)
+        Commentary.objects.create(user=self.worker, task=self.task, content="Hi")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def export(self, *args):
+        out = StringIO()
+        call_command(
+            "export_data",
+            self.directory.name,
+            "--jobs",
+            str(self.jobs),
+            *args,
+            stdout=out,
+        )
+        with open(os.path.join(self.directory.name, "manifest.json")) as f:
+            return json.load(f), out.getvalue()
+
+    def test_writes_ndjson_per_table(self):
+        manifest, output = self.export()
+        tables = {table["table"]: table for table in manifest["tables"]}
+        self.assertEqual(tables["tasks_task_assignees"]["rows"], 1)
+        self.assertEqual(tables["tasks_commentary"]["rows"], 1)
+        self.assertIn("rows/s", output)
+
+        path = os.path.join(self.directory.name, "tasks_task.ndjson")
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[0]["id"], self.task.id)
+        self.assertEqual(rows[0]["task_type_id"], self.task.task_type_id)
+        self.assertEqual(rows[0]["deadline"], self.task.deadline.isoformat())
+
+    def test_gzip(self):
+        manifest, _ = self.export("--gzip")
+        self.assertTrue(
+            all(table["file"].endswith(".ndjson.gz") for table in manifest["tables"])
+        )
+        path = os.path.join(self.directory.name, "tasks_task_assignees.ndjson.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            row = json.loads(f.readline())
+        self.assertEqual(row["worker_id"], self.worker.id)
+
+
+class ExportDataTest(ExportDataTests, TestCase):
+    pass
+
+
+class ParallelExportDataTest(ExportDataTests, TransactionTestCase):
+    """The default path: one thread and connection per table."""
+
+    jobs = 4
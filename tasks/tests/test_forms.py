@@ -85,6 +85,26 @@ class FormTests(TestCase):
         form = TaskCreateForm(data=form_data)
         self.assertTrue(form.is_valid(), form.errors)
 
+    def test_assignee_picker_renders_and_validates_only_selected(self):
+        others = [
+            Worker.objects.create_user(username=f"other{i}", position=self.position)
+            for i in range(5)
+        ]
+        form = TaskCreateForm(
+            data={"assignees": [self.worker.id, others[0].id]},
+        )
+        with self.assertNumQueries(1):
+            form.is_valid()
+        self.assertEqual(set(form.cleaned_data["assignees"]), {self.worker, others[0]})
+        html = str(form["assignees"])
+        self.assertIn("data-autocomplete-url", html)
+        self.assertIn("testuser", html)
+        self.assertNotIn("other1", html)
+
+        form = TaskCreateForm(data={"assignees": [0]})
+        form.is_valid()
+        self.assertIn("assignees", form.errors)
+
     def test_task_create_form_invalid_data(self):
         form = TaskCreateForm(data={})
         self.assertFalse(form.is_valid())
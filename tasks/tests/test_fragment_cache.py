@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Position, Task, TaskType, Worker
+
+
+@override_settings(LIST_CACHE_ENABLED=True)
+class TaskDetailFragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.position = Position.objects.create(name="Developer")
+        self.user = Worker.objects.create_user(
+            username="viewer", position=self.position
+        )
+        self.task = Task.objects.create(
+            name="Fix",
+            description="",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        self.url = reverse("tasks:task-detail", kwargs={"pk": self.task.pk})
+        self.client.force_login(self.user)
+
+    def add_assignees(self, count):
+        positions = [Position.objects.create(name=f"P{i}") for i in range(3)]
+        workers = [
+            Worker.objects.create_user(
+                username=f"a{len(self.task.assignees.all())}-{i}",
+                position=positions[i % 3],
+            )
+            for i in range(count)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignees.add(*workers)
+        return workers
+
+    def test_query_count_does_not_grow_with_assignees(self):
+        self.add_assignees(2)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        self.add_assignees(10)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertContains(response, "P2", count=3)
+
+        # Cached grid: the assignee query is skipped entirely.
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"assignees_cursor": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_assignment_invalidates_grid(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("tasks:worker-assign-remove", kwargs={"pk": self.task.pk}),
+                {"action": "assign"},
+            )
+        response = self.client.get(self.url)
+        self.assertTrue(response.context["task"].is_assigned_to_me)
+        self.assertContains(response, "Remove me from this task")
+        self.assertContains(response, "View profile", count=1)
+
+    def test_worker_changes_invalidate_grid(self):
+        (worker,) = self.add_assignees(1)
+        self.client.get(self.url)
+        worker.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            worker.save()
+        self.assertContains(self.client.get(self.url), "renamed")
+
+    def test_header_is_per_user(self):
+        other = Worker.objects.create_user(username="other", position=self.position)
+        self.client.get(self.url)
+        self.client.force_login(other)
+        response = self.client.get(self.url)
+        self.assertContains(
+            response, reverse("tasks:worker-detail", kwargs={"pk": other.pk})
+        )
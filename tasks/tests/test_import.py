@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.archive import archive
+from tasks.management.commands.import_data import (
+    INDEX_STATE_FILE,
+    Command as ImportCommand,
+    copy_value,
+    read_rows,
+)
+from tasks.models import (
+    ArchivedAssignment,
+    ArchivedCommentary,
+    ArchivedTask,
+    Commentary,
+    Position,
+    Task,
+    TaskType,
+    Worker,
+)
+
+
+class ImportDataTest(TestCase):
+    def setUp(self):
+        position = Position.objects.create(name="Developer")
+        workers = [
+            Worker.objects.create_user(username=f"worker{index}", position=position)
+            for index in range(3)
+        ]
+        Worker.objects.filter(pk=workers[0].pk).update(
+            avatar_variants={"110.jpg": "avatars/a_110.jpg"}
+        )
+        group = Group.objects.create(name="Leads")
+        group.permissions.add(Permission.objects.get(codename="change_task"))
+        workers[0].groups.add(group)
+        workers[1].user_permissions.add(Permission.objects.get(codename="add_task"))
+        task_type = TaskType.objects.create(name="Bug")
+        for index in range(5):
+            task = Task.objects.create(
+                name=f"Task {index}",
+                description="Line one\nline\ttwo \\ three",
+                deadline=timezone.now(),
+                task_type=task_type,
+                is_completed=bool(index % 2),
+            )
+            task.assignees.set(workers[: index % 3 + 1])
+            Commentary.objects.create(user=workers[0], task=task, content="Hi")
+        Task.objects.filter(name="Task 1").update(
+            completed_at=timezone.now() - timedelta(days=60)
+        )
+        list(archive(days=30))
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        call_command(
+            "export_data",
+            self.directory.name,
+            "--gzip",
+            "--jobs",
+            "1",
+            stdout=StringIO(),
+        )
+        self.snapshot = self.dump()
+
+    def dump(self):
+        return {
+            "tasks": list(Task.objects.order_by("pk").values()),
+            "workers": list(Worker.objects.order_by("pk").values()),
+            "groups": list(Group.permissions.through.objects.order_by("pk").values()),
+            "worker_groups": list(
+                Worker.groups.through.objects.order_by("pk").values()
+            ),
+            "worker_permissions": list(
+                Worker.user_permissions.through.objects.order_by("pk").values()
+            ),
+            "assignees": list(Task.assignees.through.objects.order_by("pk").values()),
+            "comments": list(Commentary.objects.order_by("pk").values()),
+            "archived_tasks": list(ArchivedTask.objects.order_by("pk").values()),
+            "archived_comments": list(
+                ArchivedCommentary.objects.order_by("pk").values()
+            ),
+            "archived_assignees": list(
+                ArchivedAssignment.objects.order_by("pk").values()
+            ),
+        }
+
+    def clear(self):
+        Group.objects.all().delete()
+        Position.objects.all().delete()
+        TaskType.objects.all().delete()
+
+    def test_round_trip(self):
+        self.assertTrue(self.snapshot["archived_comments"])
+        self.assertTrue(self.snapshot["archived_assignees"])
+        self.clear()
+        out = StringIO()
+        call_command(
+            "import_data", self.directory.name, "--batch-size", "2", stdout=out
+        )
+        self.assertEqual(self.dump(), self.snapshot)
+        self.assertIn("rows/s", out.getvalue())
+
+        task = Task.objects.create(
+            name="New",
+            description="",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.first(),
+        )
+        self.assertGreater(task.pk, self.snapshot["tasks"][-1]["id"])
+
+    def test_copy_value_writes_json_fields_as_json(self):
+        rows = read_rows(os.path.join(self.directory.name, "tasks_worker.ndjson.gz"))
+        variants = next(
+            row["avatar_variants"] for row in rows if row["avatar_variants"]
+        )
+        self.assertEqual(
+            json.loads(copy_value(variants)), {"110.jpg": "avatars/a_110.jpg"}
+        )
+
+    def test_permissions_are_matched_by_natural_key(self):
+        self.clear()
+        permission = Permission.objects.get(codename="change_task")
+        permission.delete()
+        # Same permission, another id, as after migrating in another order.
+        moved = Permission.objects.create(
+            codename="change_task",
+            name=permission.name,
+            content_type=permission.content_type,
+        )
+        call_command("import_data", self.directory.name, stdout=StringIO())
+        self.assertEqual(list(Group.objects.get().permissions.all()), [moved])
+
+    def test_resume_rebuilds_indexes_an_interrupted_import_dropped(self):
+        state = os.path.join(self.directory.name, INDEX_STATE_FILE)
+        with open(state, "w") as f:
+            json.dump(
+                {
+                    "tasks_task": [
+                        [
+                            "task_resume_idx",
+                            "CREATE INDEX task_resume_idx ON tasks_task (name)",
+                        ]
+                    ]
+                },
+                f,
+            )
+        # pg_indexes only exists on PostgreSQL; nothing is left here.
+        with patch.object(ImportCommand, "secondary_indexes", return_value=[]):
+            call_command(
+                "import_data", self.directory.name, "--resume", stdout=StringIO()
+            )
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, "tasks_task")
+        self.assertIn("task_resume_idx", indexes)
+        self.assertFalse(os.path.exists(state))
+
+    def test_refuses_non_empty_tables(self):
+        with self.assertRaises(CommandError):
+            call_command("import_data", self.directory.name, stdout=StringIO())
+
+    def test_resume(self):
+        # As if the load stopped there: no signals, so the counters keep
+        # the exported values.
+        comments = Commentary.objects.filter(pk__gt=self.snapshot["comments"][1]["id"])
+        comments._raw_delete(comments.db)
+        Task.assignees.through.objects.filter(
+            pk__gt=self.snapshot["assignees"][2]["id"]
+        ).delete()
+        call_command("import_data", self.directory.name, "--resume", stdout=StringIO())
+        self.assertEqual(self.dump(), self.snapshot)
@@ -0,0 +1,104 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.list_cache import stats
+from tasks.models import Position, Task, TaskType, Worker
+
+
+@override_settings(LIST_CACHE_ENABLED=True)
+class ListCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.position = Position.objects.create(name="Developer")
+        self.worker = Worker.objects.create_user(
+            username="worker", position=self.position
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task = Task.objects.create(
+            name="Fix",
+            description="",
+            deadline=timezone.now(),
+            task_type=self.task_type,
+        )
+        self.client.force_login(self.worker)
+
+    def get(self, name, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name), data)
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in queries if "tasks_task" in q["sql"]]
+
+    def test_second_request_is_a_hit(self):
+        _, first = self.get("tasks:task-list", {"name": "fix"})
+        response, second = self.get("tasks:task-list", {"name": " fix "})
+        self.assertTrue(first)
+        self.assertEqual(second, [])
+        self.assertContains(response, "Fix")
+        self.assertEqual(stats()["tasks.task"], {"hits": 1, "misses": 1})
+
+    def test_off_without_a_shared_cache(self):
+        with self.settings(LIST_CACHE_ENABLED=False):
+            self.get("tasks:task-list")
+            _, second = self.get("tasks:task-list")
+        self.assertTrue(second)
+        self.assertEqual(stats()["tasks.task"], {"hits": 0, "misses": 0})
+
+    def test_saves_invalidate_dependent_pages(self):
+        self.get("tasks:task-list")
+        self.task.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        response, queries = self.get("tasks:task-list")
+        self.assertTrue(queries)
+        self.assertContains(response, "Renamed")
+
+        self.get("tasks:position-list")
+        with self.captureOnCommitCallbacks(execute=True):
+            Worker.objects.create_user(username="other", position=self.position)
+        response, _ = self.get("tasks:position-list")
+        self.assertContains(response, "2 workers")
+
+    def test_generations_move_on_commit(self):
+        self.get("tasks:task-list")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.task.save()
+            # Not committed yet: another request still gets the cached page.
+            _, queries = self.get("tasks:task-list")
+            self.assertEqual(queries, [])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_assignment_changes_invalidate(self):
+        self.get("tasks:task-list")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignees.add(self.worker)
+        _, queries = self.get("tasks:task-list")
+        self.assertTrue(queries)
+
+    def test_staff_controls_render_per_user(self):
+        self.get("tasks:position-list")
+        delete_url = reverse("tasks:position-delete", kwargs={"pk": self.position.pk})
+        admin = Worker.objects.create_superuser(
+            username="admin", password="x", position=self.position
+        )
+        response, _ = self.get("tasks:position-list")
+        self.assertNotContains(response, delete_url)
+
+        self.client.force_login(admin)
+        response, _ = self.get("tasks:position-list")
+        self.assertContains(response, delete_url)
+
+    def test_stats_command(self):
+        self.get("tasks:worker-list")
+        self.get("tasks:worker-list")
+        out = StringIO()
+        call_command("list_cache_stats", reset=True, stdout=out)
+        self.assertIn("tasks.worker", out.getvalue())
+        self.assertIn("50%", out.getvalue())
+        self.assertEqual(stats()["tasks.worker"], {"hits": 0, "misses": 0})
@@ -0,0 +1,164 @@
+import asyncio
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import assignments, live
+from tasks.models import Commentary, Position, Task, TaskType, Worker
+from tasks.views import TaskEventsView
+
+
+class HubTest(SimpleTestCase):
+    async def test_delivers_from_other_threads(self):
+        hub = live.Hub()
+        first = hub.subscribe(1)
+        second = hub.subscribe(1)
+        other = hub.subscribe(2)
+        event = {"task": 1, "type": "comment.created", "data": {"id": 5}}
+        thread = threading.Thread(target=hub.publish, args=(event,))
+        thread.start()
+        thread.join()
+        self.assertEqual(await asyncio.wait_for(first.get(), 1), event)
+        self.assertEqual(await asyncio.wait_for(second.get(), 1), event)
+        self.assertTrue(other.queue.empty())
+
+        for subscription in (first, second, other):
+            subscription.close()
+        self.assertEqual(hub.subscriber_count(), 0)
+
+    async def test_overflow_is_replaced_by_reset(self):
+        hub = live.Hub()
+        subscription = hub.subscribe(1, maxsize=2)
+        for i in range(3):
+            subscription.put({"task": 1, "type": "comment.created", "data": {"id": i}})
+        self.assertEqual(await subscription.get(), {"task": 1, "type": "reset"})
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_socket_broker_relays_between_hubs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            publisher, listener = live.Hub(), live.Hub()
+            publisher.broker = live.SocketBroker(directory, publisher, name="a")
+            listener.broker = live.SocketBroker(directory, listener, name="b")
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            stale.bind(str(Path(directory) / "c.sock"))
+            stale.close()
+            subscription = listener.subscribe(1)
+
+            event = {"task": 1, "type": "assignees.changed", "data": {}}
+            publisher.publish(event)
+            self.assertEqual(await asyncio.wait_for(subscription.get(), 1), event)
+            self.assertEqual(
+                sorted(path.name for path in Path(directory).iterdir()),
+                ["a.sock", "b.sock"],
+            )
+            publisher.broker.close()
+            listener.broker.close()
+
+
+class SignalsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        cls.task = Task.objects.create(
+            name="Fix",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+
+    def published(self, action):
+        with patch.object(live.get_hub(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [
+            (event["type"], event["data"]) for (event,), _ in publish.call_args_list
+        ]
+
+    def test_comments(self):
+        comment = Commentary(user=self.worker, task=self.task, content="Hi")
+        self.assertEqual(
+            self.published(comment.save), [("comment.created", {"id": comment.pk})]
+        )
+        pk = comment.pk
+        self.assertEqual(
+            self.published(comment.delete), [("comment.deleted", {"id": pk})]
+        )
+
+    def test_assignees(self):
+        self.assertEqual(
+            self.published(lambda: self.task.assignees.add(self.worker)),
+            [("assignees.changed", {})],
+        )
+        self.assertEqual(
+            self.published(lambda: self.worker.assigned_tasks.remove(self.task)),
+            [("assignees.changed", {})],
+        )
+        self.assertEqual(
+            self.published(
+                lambda: assignments.apply(assign={(self.task.pk, self.worker.pk)})
+            ),
+            [("assignees.changed", {})],
+        )
+
+    def test_published_only_after_commit(self):
+        with patch.object(live.get_hub(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                Commentary.objects.create(user=self.worker, task=self.task)
+        self.assertEqual(len(callbacks), 1)
+        publish.assert_not_called()
+
+
+class TaskEventsViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        cls.task = Task.objects.create(
+            name="Fix",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        cls.url = reverse("tasks:task-events", kwargs={"pk": cls.task.pk})
+
+    async def test_streams_events(self):
+        await self.async_client.aforce_login(self.worker)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+
+        live.get_hub().publish(
+            {"task": self.task.pk, "type": "comment.created", "data": {"id": 3}}
+        )
+        self.assertEqual(
+            await asyncio.wait_for(anext(stream), 1),
+            b'event: comment.created\ndata: {"id": 3}\n\n',
+        )
+        with patch.object(TaskEventsView, "heartbeat", 0.01):
+            self.assertEqual(await anext(stream), b": keepalive\n\n")
+
+        # A client disconnect cancels the response while it waits for events.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(live.get_hub().subscriber_count(), 0)
+
+    async def test_missing_task_and_anonymous(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        await self.async_client.aforce_login(self.worker)
+        response = await self.async_client.get(
+            reverse("tasks:task-events", kwargs={"pk": 0})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,119 @@
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.metrics import Registry, exposition
+from tasks.models import Position, Task, TaskType, Worker
+
+
+class RegistryTest(TestCase):
+    def test_histogram_exposition(self):
+        registry = Registry()
+        view = (("view", "tasks:task-list"),)
+        for seconds in (0.003, 0.04, 0.04, 30):
+            registry.observe("template_render_seconds", view, seconds)
+        registry.inc("db_queries_total", (("view", 'say "hi"\n'),), 3)
+        text = exposition(registry.collect())
+
+        self.assertIn("# TYPE task_manager_template_render_seconds histogram", text)
+        prefix = 'task_manager_template_render_seconds_bucket{view="tasks:task-list"'
+        self.assertIn(f'{prefix},le="0.005"}} 1', text)
+        self.assertIn(f'{prefix},le="0.025"}} 1', text)
+        self.assertIn(f'{prefix},le="0.05"}} 3', text)
+        self.assertIn(f'{prefix},le="10"}} 3', text)
+        self.assertIn(f'{prefix},le="+Inf"}} 4', text)
+        self.assertIn(
+            'task_manager_template_render_seconds_count{view="tasks:task-list"} 4',
+            text,
+        )
+        self.assertIn('task_manager_db_queries_total{view="say \\"hi\\"\\n"} 3', text)
+
+    def test_processes_are_summed_through_the_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = Registry(directory, name="1")
+            second = Registry(directory, name="2")
+            view = (("view", "tasks:task-list"),)
+            first.observe("http_request_duration_seconds", view, 0.2)
+            first.inc("db_queries_total", view, 4)
+            first.flush()
+            second.inc("db_queries_total", view, 2)
+
+            samples = second.collect()
+            self.assertEqual(samples[("db_queries_total", view)], 6)
+            self.assertEqual(
+                samples[
+                    ("http_request_duration_seconds_bucket", (*view, ("le", 0.25)))
+                ],
+                1,
+            )
+
+            first.inc("db_queries_total", view, 1)
+            first.maybe_flush()
+            self.assertEqual(second.collect()[("db_queries_total", view)], 6)
+
+
+@override_settings(LIST_CACHE_ENABLED=True)
+class MetricsMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        Task.objects.create(
+            name="Fix",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+
+    def setUp(self):
+        registry = Registry()
+        for target in ("tasks.middleware.get_registry", "tasks.views.get_registry"):
+            patcher = patch(target, return_value=registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_requests_are_recorded_by_url_name(self):
+        self.client.force_login(self.worker)
+        self.client.get(reverse("tasks:position-list"))
+        self.client.get(reverse("tasks:position-list"))
+        self.client.get("/no-such-page/")
+
+        text = self.client.get(reverse("tasks:metrics")).content.decode()
+        view = 'view="tasks:position-list"'
+        self.assertIn(
+            f'task_manager_http_request_duration_seconds_count{{method="GET",{view}}} 2',
+            text,
+        )
+        self.assertIn(
+            f'task_manager_http_responses_total{{status="200",{view}}} 2', text
+        )
+        self.assertIn(
+            'task_manager_http_responses_total{status="404",view="<unmatched>"} 1', text
+        )
+        self.assertIn(
+            f'task_manager_list_cache_lookups_total{{result="hit",{view}}} 1', text
+        )
+        self.assertIn(
+            f'task_manager_list_cache_lookups_total{{result="miss",{view}}} 1', text
+        )
+        self.assertIn(f"task_manager_db_queries_total{{{view}}}", text)
+        self.assertIn(f"task_manager_template_render_seconds_count{{{view}}} 2", text)
+
+    def test_only_internal_or_superuser(self):
+        url = reverse("tasks:metrics")
+        self.assertEqual(
+            self.client.get(url, REMOTE_ADDR="203.0.113.1").status_code, 403
+        )
+        self.client.force_login(
+            Worker.objects.create_superuser(
+                username="admin", password="x", position=self.worker.position
+            )
+        )
+        response = self.client.get(url, REMOTE_ADDR="203.0.113.1")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
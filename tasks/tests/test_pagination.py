@@ -0,0 +1,155 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.paginator import EmptyPage
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskType, Position
+from tasks.pagination import (
+    EstimatedCountPaginator,
+    KeysetPaginator,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        task_type = TaskType.objects.create(name="Bug")
+        now = timezone.now()
+        for index in range(13):
+            Task.objects.create(
+                name=f"Task {index % 4}",
+                description="Long description",
+                deadline=now + timedelta(days=index % 3),
+                task_type=task_type,
+            )
+        self.ordering = ("name", "-deadline", "id")
+        self.expected = list(
+            Task.objects.order_by(*self.ordering).values_list("id", flat=True)
+        )
+
+    def test_walks_forward_and_backward(self):
+        paginator = KeysetPaginator(Task.objects.all(), 5, self.ordering)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+
+        seen = [task.id for page in pages for task in page]
+        self.assertEqual(seen, self.expected)
+        self.assertEqual([len(page) for page in pages], [5, 5, 3])
+        self.assertFalse(pages[0].has_previous())
+
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual([task.id for task in previous], [task.id for task in pages[1]])
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual([task.id for task in first], self.expected[:5])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(Task.objects.all(), 5, self.ordering)
+        with self.assertRaises(InvalidCursor):
+            paginator.page("not-a-cursor")
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("e30")
+        for values in ([None, None, None], ["x", "2020-01-01T00:00:00+00:00", None]):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(encode_cursor(values))
+
+
+@patch("tasks.pagination.is_postgres", lambda queryset: True)
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self):
+        task_type = TaskType.objects.create(name="Bug")
+        for index in range(7):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="",
+                deadline=timezone.now(),
+                task_type=task_type,
+            )
+
+    def test_large_unfiltered_table_uses_reltuples(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by("id"), 5)
+        with patch.object(paginator, "_table_estimate", return_value=250_000):
+            with self.assertNumQueries(0):
+                self.assertEqual(paginator.count, 250_000)
+        self.assertTrue(paginator.count_is_estimated)
+
+    def test_small_estimates_fall_back_to_exact_count(self):
+        paginator = EstimatedCountPaginator(Task.objects.all(), 5)
+        with patch.object(paginator, "_table_estimate", return_value=None):
+            self.assertEqual(paginator.count, 7)
+        paginator = EstimatedCountPaginator(Task.objects.filter(name="Task 1"), 5)
+        with patch.object(paginator, "_plan_estimate", return_value=3) as plan:
+            self.assertEqual(paginator.count, 1)
+        plan.assert_called_once()
+        self.assertFalse(paginator.count_is_estimated)
+
+    def test_pages_past_an_undershooting_estimate(self):
+        paginator = EstimatedCountPaginator(Task.objects.order_by("id"), 5)
+        paginator.exact_count_cap = 1
+        with patch.object(paginator, "_table_estimate", return_value=4):
+            self.assertEqual(paginator.num_pages, 1)
+        self.assertEqual(len(paginator.page(2)), 2)
+        with self.assertRaises(EmptyPage):
+            paginator.page(3)
+
+
+class KeysetListViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        position = Position.objects.create(name="Developer")
+        user = get_user_model().objects.create_user(
+            username="testuser", password="testpassword", position=position
+        )
+        self.client.force_login(user)
+        task_type = TaskType.objects.create(name="Bug")
+        for index in range(7):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Long description",
+                deadline=timezone.now(),
+                task_type=task_type,
+            )
+
+    def test_task_list_uses_cursor(self):
+        response = self.client.get(reverse("tasks:task-list"))
+        page = response.context["page_obj"]
+        self.assertTrue(page.is_keyset)
+        self.assertContains(response, "cursor=")
+        self.assertEqual(
+            page[0].get_deferred_fields(),
+            {"description", "task_type_id", "comment_count", "completed_at"},
+        )
+
+        response = self.client.get(
+            reverse("tasks:task-list"), {"cursor": page.next_cursor}
+        )
+        self.assertContains(response, "Task 6")
+        self.assertNotContains(response, "Task 0")
+
+    def test_page_number_still_supported(self):
+        response = self.client.get(reverse("tasks:task-list"), {"page": 2})
+        self.assertEqual(response.context["page_obj"].number, 2)
+        self.assertContains(response, "2 of 2")
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("tasks:task-list"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            reverse("tasks:task-list"), {"cursor": encode_cursor([None, None, None])}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_estimated_count_is_labelled(self):
+        with patch.object(
+            EstimatedCountPaginator, "estimate", return_value=50_000
+        ), patch.object(EstimatedCountPaginator, "exact_count_cap", 100):
+            response = self.client.get(reverse("tasks:task-list"), {"page": 2})
+        self.assertContains(response, "2 of about 10000")
@@ -62,3 +62,20 @@ class PositionViewsTest(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Position.objects.filter(id=self.position1.id).exists())
+
+    def test_position_detail_view_pages_workers(self):
+        for i in range(14):
+            get_user_model().objects.create_user(
+                username=f"dev{i:02}", position=self.position1
+            )
+        url = reverse("tasks:position-detail", args=[self.position1.id])
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        page = response.context["page_obj"]
+        self.assertEqual(len(page), 12)
+        self.assertContains(response, "14 workers")
+        response = self.client.get(url, {"cursor": page.next_cursor})
+        self.assertEqual(
+            [w.username for w in response.context["page_obj"]], ["dev12", "dev13"]
+        )
+        self.assertEqual(self.client.get(url, {"cursor": "x"}).status_code, 404)
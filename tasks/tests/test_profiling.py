@@ -0,0 +1,129 @@
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.middleware import ProfilingMiddleware
+from tasks.models import Position, Worker
+from tasks.profiling import Capture, ProfileRing
+
+
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(
+            PROFILING_DIR=directory.name, PROFILING_TOKEN="secret", PROFILING_KEEP=2
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client.force_login(self.worker)
+
+    def test_off_without_directory(self):
+        with override_settings(PROFILING_DIR=None):
+            with self.assertRaises(MiddlewareNotUsed):
+                ProfilingMiddleware(lambda request: None)
+
+    def test_profiles_requests_with_the_token(self):
+        url = reverse("tasks:worker-list")
+        self.assertNotIn("X-Profile-Id", self.client.get(url))
+        self.assertNotIn("X-Profile-Id", self.client.get(url, HTTP_X_PROFILE="wrong"))
+
+        response = self.client.get(url, HTTP_X_PROFILE="secret")
+        name = response["X-Profile-Id"]
+        self.assertTrue((self.directory / f"{name}.prof").is_file())
+        summary = json.loads((self.directory / f"{name}.json").read_text())
+        self.assertEqual(summary["view"], "tasks:worker-list")
+        self.assertEqual(summary["status"], 200)
+        self.assertTrue(summary["functions"])
+        self.assertIsNone(summary["memory"])
+
+        response = self.client.get(
+            url, HTTP_X_PROFILE="secret", HTTP_X_PROFILE_MEMORY="1"
+        )
+        summary = json.loads(
+            (self.directory / f"{response['X-Profile-Id']}.json").read_text()
+        )
+        self.assertGreater(summary["memory"]["peak_kib"], 0)
+        self.assertTrue(summary["memory"]["top"])
+
+    def test_sampling(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1.0):
+            response = self.client.get(reverse("tasks:worker-list"))
+        self.assertIn("X-Profile-Id", response)
+
+    def test_ring_keeps_the_newest(self):
+        names = [
+            self.client.get(reverse("tasks:welcome"), HTTP_X_PROFILE="secret")[
+                "X-Profile-Id"
+            ]
+            for _ in range(3)
+        ]
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            sorted(
+                f"{name}.{suffix}" for name in names[1:] for suffix in ("json", "prof")
+            ),
+        )
+        ring = ProfileRing(self.directory)
+        self.assertEqual([entry["id"] for entry in ring.entries()], names[:0:-1])
+        self.assertIsNone(ring.path("../secret.json"))
+
+    def test_overlapping_memory_captures(self):
+        tracing = tracemalloc.is_tracing()
+        first, second = Capture(memory=True), Capture(memory=True)
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        self.assertTrue(tracemalloc.is_tracing())
+        second.__exit__(None, None, None)
+        self.assertEqual(tracemalloc.is_tracing(), tracing)
+        self.assertIsNotNone(first.allocations())
+        self.assertIsNotNone(second.allocations())
+
+
+class ProfileAdminTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(PROFILING_DIR=directory.name, PROFILING_TOKEN="t")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        position = Position.objects.create(name="Developer")
+        self.admin = Worker.objects.create_superuser(
+            username="admin", password="x", position=position
+        )
+        self.staff = Worker.objects.create_user(
+            username="staff", position=position, is_staff=True
+        )
+
+    def test_superuser_lists_and_downloads(self):
+        self.client.force_login(self.admin)
+        name = self.client.get(reverse("tasks:welcome"), HTTP_X_PROFILE="t")[
+            "X-Profile-Id"
+        ]
+        response = self.client.get(reverse("profile-list"))
+        self.assertContains(response, reverse("tasks:welcome"))
+        self.assertContains(
+            response, reverse("profile-download", args=[f"{name}.prof"])
+        )
+
+        response = self.client.get(reverse("profile-download", args=[f"{name}.json"]))
+        self.assertEqual(json.loads(b"".join(response.streaming_content))["id"], name)
+        response = self.client.get(reverse("profile-download", args=["missing.prof"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_staff_is_forbidden(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse("profile-list")).status_code, 403)
@@ -0,0 +1,69 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.middleware import QueryBudgetExceeded, fingerprint_sql
+from tasks.models import Task, TaskType, Position, Worker
+
+
+class FingerprintTest(TestCase):
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint_sql("SELECT *  FROM t WHERE a = 'x' AND b IN (1, 2, 3)"),
+            fingerprint_sql("SELECT * FROM t\nWHERE a = 'y' AND b IN (4)"),
+        )
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        position = Position.objects.create(name="Developer")
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="testpassword", position=position
+        )
+        self.client.force_login(self.user)
+        self.task = Task.objects.create(
+            name="Fix issue",
+            description="Fix the reported issue",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        for index in range(3):
+            self.task.assignees.add(
+                Worker.objects.create_user(
+                    username=f"worker{index}",
+                    position=Position.objects.create(name=f"Position {index}"),
+                )
+            )
+
+    def test_report_is_attached_to_request(self):
+        response = self.client.get(reverse("tasks:task-detail", args=[self.task.id]))
+        report = response.wsgi_request.query_report
+        self.assertEqual(report["view"], "tasks:task-detail")
+        self.assertGreater(report["queries"], 0)
+        self.assertIsNotNone(report["render_time_ms"])
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_task_detail_stays_within_budget(self):
+        response = self.client.get(reverse("tasks:task-detail", args=[self.task.id]))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        QUERY_BUDGET_RAISE=True, QUERY_BUDGETS={"tasks:task-detail": {"queries": 1}}
+    )
+    def test_raise_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("tasks:task-detail", args=[self.task.id]))
+
+    @override_settings(
+        QUERY_BUDGET_RAISE=False, QUERY_BUDGETS={"tasks:task-detail": {"queries": 1}}
+    )
+    def test_breach_is_logged_as_json(self):
+        with self.assertLogs("tasks.query_budget", "WARNING") as logs:
+            self.client.get(reverse("tasks:task-detail", args=[self.task.id]))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["event"], "query_budget_exceeded")
+        self.assertEqual(record["breaches"]["queries"]["limit"], 1)
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.management.commands.check_query_plans import postgres_problems
+from tasks.models import Task, TaskType, Position, Worker
+
+
+class FakeQuerySet:
+    def __init__(self, plan):
+        self.plan = plan
+
+    def explain(self, format=None):
+        return self.plan
+
+
+class CheckQueryPlansTest(TestCase):
+    def setUp(self):
+        position = Position.objects.create(name="Developer")
+        Worker.objects.create_user(username="worker", position=position)
+        task_type = TaskType.objects.create(name="Bug")
+        Task.objects.create(
+            name="Fix issue",
+            description="Fix the reported issue",
+            deadline=timezone.now(),
+            task_type=task_type,
+        )
+
+    def test_passes_below_threshold(self):
+        out = StringIO()
+        call_command("check_query_plans", "--max-rows", "100", stdout=out)
+        self.assertIn("OK   tasks:task-list", out.getvalue())
+        self.assertNotIn("FAIL", out.getvalue())
+
+    def test_fails_above_threshold(self):
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_query_plans", "--max-rows", "0", stdout=out)
+        self.assertIn("FAIL tasks:worker-detail", out.getvalue())
+        # Reads the stored worker_count; no GROUP BY left to sort.
+        self.assertIn("OK   tasks:position-list", out.getvalue())
+
+    def test_postgres_plan_parsing(self):
+        plan = (
+            '[{"Plan": {"Node Type": "Limit", "Plan Rows": 5, "Plans": ['
+            '{"Node Type": "Sort", "Plan Rows": 50000, "Plans": ['
+            '{"Node Type": "Seq Scan", "Relation Name": "tasks_task",'
+            ' "Plan Rows": 50000}]}]}}]'
+        )
+        problems = postgres_problems(FakeQuerySet(plan), 1000)
+        self.assertEqual(
+            problems,
+            ["Sort on - (~50000 rows)", "Seq Scan on tasks_task (~50000 rows)"],
+        )
+        self.assertEqual(postgres_problems(FakeQuerySet(plan), 100000), [])
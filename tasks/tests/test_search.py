@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskType, Position, Worker
+from tasks.search import search_contains, search_tasks_full_text
+
+
+class SearchBackendTest(TestCase):
+    def setUp(self):
+        self.position = Position.objects.create(name="Developer")
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.task1 = Task.objects.create(
+            name="Fix login",
+            description="Session cookie expires too early",
+            deadline=timezone.now(),
+            task_type=self.task_type,
+        )
+        self.task2 = Task.objects.create(
+            name="Write docs",
+            description="Describe the deployment",
+            deadline=timezone.now(),
+            task_type=self.task_type,
+        )
+
+    def test_search_contains_is_case_insensitive(self):
+        result = search_contains(Task.objects.all(), "name", "  LOGIN ")
+        self.assertEqual(list(result), [self.task1])
+
+    def test_search_contains_empty_term(self):
+        result = search_contains(Worker.objects.all(), "username", "")
+        self.assertEqual(result.count(), Worker.objects.count())
+
+    def test_full_text_fallback_searches_description(self):
+        result = search_tasks_full_text(Task.objects.all(), "cookie")
+        self.assertEqual(list(result), [self.task1])
+
+
+class TaskListFullTextTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        position = Position.objects.create(name="Developer")
+        user = get_user_model().objects.create_user(
+            username="testuser", password="testpassword", position=position
+        )
+        self.client.force_login(user)
+        task_type = TaskType.objects.create(name="Bug")
+        Task.objects.create(
+            name="Fix login",
+            description="Session cookie expires too early",
+            deadline=timezone.now(),
+            task_type=task_type,
+        )
+        Task.objects.create(
+            name="Cookie banner",
+            description="Show consent popup",
+            deadline=timezone.now(),
+            task_type=task_type,
+        )
+
+    def test_full_text_mode(self):
+        response = self.client.get(
+            reverse("tasks:task-list"), {"name": "cookie", "full_text": "on"}
+        )
+        self.assertContains(response, "Fix login")
+        self.assertNotContains(response, "Cookie banner")
+        self.assertFalse(getattr(response.context["page_obj"], "is_keyset", False))
+
+    def test_name_mode(self):
+        response = self.client.get(reverse("tasks:task-list"), {"name": "cookie"})
+        self.assertContains(response, "Cookie banner")
+        self.assertNotContains(response, "Fix login")
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import slow_queries
+from tasks.middleware import SlowQueryMiddleware
+from tasks.models import Position, SlowQuery, Task, TaskType, Worker
+
+
+@override_settings(SLOW_QUERY_MS=0)
+class SlowQueryMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.worker = Worker.objects.create_user(
+            username="worker", position=Position.objects.create(name="Developer")
+        )
+        cls.task = Task.objects.create(
+            name="Fix",
+            deadline=timezone.now(),
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        cls.task.assignees.add(cls.worker)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.worker)
+
+    def test_records_view_caller_and_template(self):
+        url = reverse("tasks:task-detail", kwargs={"pk": self.task.pk})
+        self.client.get(url)
+        queries = SlowQuery.objects.filter(view="tasks:task-detail")
+        self.assertTrue(queries.filter(caller__startswith="tasks/").exists())
+        assignees = queries.get(template__startswith="tasks/task_detail.html:")
+        self.assertIn("tasks_task_assignees", assignees.sql)
+        self.assertEqual(assignees.count, 1)
+
+        cache.clear()
+        self.client.get(url)
+        assignees.refresh_from_db()
+        self.assertEqual(assignees.count, 2)
+        self.assertGreaterEqual(assignees.total_ms, assignees.max_ms)
+
+    def test_fingerprints_ignore_literals(self):
+        for name in ("Alpha", "Beta"):
+            self.client.get(reverse("tasks:task-list"), {"name": name})
+        search = SlowQuery.objects.get(
+            view="tasks:task-list", fingerprint__contains="LIKE"
+        )
+        self.assertEqual(search.count, 2)
+        self.assertNotIn("Beta", search.fingerprint)
+
+    def test_off_without_threshold(self):
+        with override_settings(SLOW_QUERY_MS=None):
+            with self.assertRaises(MiddlewareNotUsed):
+                SlowQueryMiddleware(lambda request: None)
+
+    def test_no_explain_inside_a_transaction(self):
+        # Every TestCase runs in one, so no backend gets an EXPLAIN here.
+        self.assertTrue(connection.in_atomic_block)
+        with override_settings(SLOW_QUERY_EXPLAIN_RATE=1):
+            self.assertEqual(slow_queries.explain(connection, "SELECT 1", ()), "")
+
+    def test_report(self):
+        self.client.get(reverse("tasks:task-list"))
+        out = StringIO()
+        call_command("slow_queries", order_by="max", limit=3, stdout=out)
+        output = out.getvalue()
+        self.assertIn("tasks:task-list", output)
+        self.assertIn("caller: tasks/", output)
+
+        call_command("slow_queries", reset=True, stdout=StringIO())
+        self.assertFalse(SlowQuery.objects.exists())
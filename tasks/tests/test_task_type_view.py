@@ -1,7 +1,8 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from tasks.models import TaskType, Position
+from django.utils import timezone
+from tasks.models import TaskType, Position, Task
 
 
 class TaskTypeViewsTest(TestCase):
@@ -62,3 +63,32 @@ class TaskTypeViewsTest(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertFalse(TaskType.objects.filter(id=self.task_type1.id).exists())
+
+    def test_task_type_detail_pages_and_filters(self):
+        for i, priority in enumerate(["High", "Low", "High", "Medium", "High", "Low"]):
+            Task.objects.create(
+                name=f"task{i}",
+                description="",
+                deadline=timezone.now(),
+                priority=priority,
+                is_completed=i % 2 == 0,
+                task_type=self.task_type1,
+            )
+        url = reverse("tasks:task-type-detail", args=[self.task_type1.id])
+
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        page = response.context["page_obj"]
+        self.assertEqual([t.name for t in page], [f"task{i}" for i in range(5)])
+        response = self.client.get(url, {"cursor": page.next_cursor})
+        self.assertEqual([t.name for t in response.context["page_obj"]], ["task5"])
+
+        response = self.client.get(url, {"completed": "yes", "priority": "High"})
+        self.assertEqual(
+            [t.name for t in response.context["page_obj"]],
+            ["task0", "task2", "task4"],
+        )
+        response = self.client.get(url, {"completed": "no", "priority": "Low"})
+        self.assertEqual(
+            [t.name for t in response.context["page_obj"]], ["task1", "task5"]
+        )
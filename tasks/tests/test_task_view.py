@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils import timezone
@@ -105,3 +106,64 @@ class TaskViewsTest(TestCase):
         response = self.client.post(reverse("tasks:task-delete", args=[self.task1.id]))
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Task.objects.filter(id=self.task1.id).exists())
+
+
+class TaskDetailQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        positions = Position.objects.bulk_create(
+            Position(name=f"Position {i}") for i in range(5)
+        )
+        cls.user = Worker.objects.create_user(username="viewer", position=positions[0])
+        Worker.objects.bulk_create(
+            Worker(username=f"worker{i:04}", position=positions[i % 5])
+            for i in range(1000)
+        )
+        cls.task_type = TaskType.objects.create(name="Bug")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def make_task(self, assignees):
+        task = Task.objects.create(
+            name=f"Task with {assignees}",
+            description="",
+            deadline=timezone.now(),
+            task_type=self.task_type,
+        )
+        workers = Worker.objects.filter(username__startswith="worker")
+        task.assignees.add(*workers.order_by("username")[:assignees])
+        return task
+
+    def test_query_count_is_constant(self):
+        for assignees in (1, 100, 1000):
+            with self.subTest(assignees=assignees):
+                task = self.make_task(assignees)
+                url = reverse("tasks:task-detail", args=[task.id])
+                with self.assertNumQueries(4):
+                    response = self.client.get(url)
+                page = response.context["assignee_page"]
+                self.assertEqual(len(page), min(assignees, 20))
+                self.assertEqual(page.has_next(), assignees > 20)
+                self.assertFalse(response.context["task"].is_assigned_to_me)
+
+    def test_assignee_cards_page_above_threshold(self):
+        task = self.make_task(45)
+        url = reverse("tasks:task-detail", args=[task.id])
+        response = self.client.get(url)
+        self.assertNotContains(response, "worker0020")
+        page = response.context["assignee_page"]
+
+        response = self.client.get(url, {"assignees_cursor": page.next_cursor})
+        self.assertContains(response, "worker0020")
+        self.assertNotContains(response, "worker0019")
+        self.assertContains(response, "assignees_cursor=")
+
+    def test_membership_and_comment_count(self):
+        task = self.make_task(1)
+        task.assignees.add(self.user)
+        response = self.client.get(reverse("tasks:task-detail", args=[task.id]))
+        self.assertTrue(response.context["task"].is_assigned_to_me)
+        self.assertContains(response, "Remove me from this task")
+        self.assertEqual(response.context["task"].comment_count, 0)
@@ -1,9 +1,13 @@
+from unittest.mock import patch
+
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from tasks.models import Worker, Position, Task, TaskType
 from django.utils import timezone
 
+from tasks.views import WorkerTaskHistoryView
+
 
 class WorkerViewsTest(TestCase):
     def setUp(self):
@@ -142,14 +146,108 @@ class WorkerViewsTest(TestCase):
         )
         self.client.force_login(self.worker1)
 
-        response = self.client.post(
-            reverse("tasks:worker-assign-remove", args=[task.id])
+        url = reverse("tasks:worker-assign-remove", args=[task.id])
+        for _ in range(2):
+            response = self.client.post(url, {"action": "assign"})
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(task.assignees.filter(id=self.worker1.id).exists())
+
+        for _ in range(2):
+            response = self.client.post(url, {"action": "unassign"})
+            self.assertEqual(response.status_code, 302)
+            self.assertFalse(task.assignees.filter(id=self.worker1.id).exists())
+
+        self.assertEqual(self.client.post(url).status_code, 400)
+
+
+class WorkerTaskHistoryTest(TestCase):
+    def setUp(self):
+        position = Position.objects.create(name="Developer")
+        self.worker = Worker.objects.create_user(username="worker", position=position)
+        self.client.force_login(self.worker)
+        task_type = TaskType.objects.create(name="Bug")
+        now = timezone.now()
+        self.tasks = {}
+        for name, days, completed in [
+            ("late", -2, False),
+            ("soon", 1, False),
+            ("later", 5, False),
+            ("done-old", -10, True),
+            ("done-new", -1, True),
+        ]:
+            task = Task.objects.create(
+                name=name,
+                description="",
+                deadline=now + timezone.timedelta(days=days),
+                is_completed=completed,
+                task_type=task_type,
+            )
+            task.assignees.add(self.worker)
+            self.tasks[name] = task
+        self.url = reverse("tasks:worker-detail", kwargs={"pk": self.worker.pk})
+
+    def test_tabs_and_counts(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response.context["task_counts"], {"open": 2, "overdue": 1, "completed": 2}
         )
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(task.assignees.filter(id=self.worker1.id).exists())
+        self.assertEqual(
+            [task.name for task in response.context["page_obj"]],
+            ["late", "soon", "later"],
+        )
+        self.assertTrue(response.context["page_obj"][0].is_overdue)
+        self.assertContains(response, "1 overdue")
 
-        response = self.client.post(
-            reverse("tasks:worker-assign-remove", args=[task.id])
+        response = self.client.get(self.url, {"status": "completed"})
+        self.assertEqual(
+            [task.name for task in response.context["page_obj"]],
+            ["done-new", "done-old"],
+        )
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+    def test_json_pages_follow_cursor(self):
+        url = reverse("tasks:worker-task-history", kwargs={"pk": self.worker.pk})
+        with patch.object(WorkerTaskHistoryView, "tasks_per_page", 2):
+            first = self.client.get(url).json()
+            second = self.client.get(url, {"cursor": first["next_cursor"]}).json()
+        self.assertEqual([t["name"] for t in first["results"]], ["late", "soon"])
+        self.assertTrue(first["results"][0]["is_overdue"])
+        self.assertEqual([t["name"] for t in second["results"]], ["later"])
+        self.assertIsNone(second["next_cursor"])
+
+        self.assertEqual(self.client.get(url, {"cursor": "junk"}).status_code, 404)
+        missing = reverse("tasks:worker-task-history", kwargs={"pk": 0})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        self.developer = Position.objects.create(name="Developer")
+        self.tester = Position.objects.create(name="Tester")
+        for i in range(30):
+            Worker.objects.create_user(username=f"dev{i:02}", position=self.developer)
+        Worker.objects.create_user(username="devtest", position=self.tester)
+        self.url = reverse("tasks:worker-autocomplete")
+
+    def test_worker_results_are_limited_and_filterable(self):
+        self.client.force_login(Worker.objects.get(username="devtest"))
+        results = self.client.get(self.url, {"q": "dev"}).json()["results"]
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[0]["text"], "dev00")
+
+        results = self.client.get(
+            self.url, {"q": "dev", "position": self.tester.pk}
+        ).json()["results"]
+        self.assertEqual([r["text"] for r in results], ["devtest"])
+
+    def test_worker_search_requires_login_but_positions_do_not(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        response = self.client.get(
+            reverse("tasks:position-autocomplete"), {"q": "test"}
+        )
+        self.assertEqual(
+            response.json(), {"results": [{"id": self.tester.pk, "text": "Tester"}]}
         )
-        self.assertEqual(response.status_code, 302)
-        self.assertFalse(task.assignees.filter(id=self.worker1.id).exists())
@@ -2,62 +2,80 @@ from django.urls import path
 
 from tasks.views import (
     index,
-    PositionListView,
+    AsyncPositionListView,
     PositionFormatCreateView,
-    PositionDetailView,
+    AsyncPositionDetailView,
     PositionFormatDeleteView,
-    TaskListView,
+    AsyncTaskListView,
     TaskFormatCreateView,
-    TaskDetailView,
+    AsyncTaskDetailView,
     TaskFormatDeleteView,
     TaskFormatUpdateView,
-    WorkerListView,
-    WorkerDetailView,
+    AsyncWorkerListView,
+    AsyncWorkerDetailView,
+    WorkerTaskHistoryView,
+    AssignmentsView,
+    PositionAutocompleteView,
+    WorkerAutocompleteView,
+    AsyncCommentsSinceView,
+    TaskEventsView,
     WorkerFormatCreateView,
     WorkerFormatUpdateView,
     WorkerFormatDeleteView,
-    TaskTypeListView,
-    TaskTypeDetailView,
+    AsyncTaskTypeListView,
+    AsyncTaskTypeDetailView,
     TaskTypeFormatCreateView,
     TaskTypeFormatDeleteView,
     AssignOrRemoveWorkerView,
-    CommentListView,
+    AsyncCommentListView,
     upload_avatar,
     delete_comment,
+    metrics,
     CustomLoginView,
 )
 
 urlpatterns = [
     path("", index, name="welcome"),
-    path("positions/", PositionListView.as_view(), name="position-list"),
+    path("positions/", AsyncPositionListView.as_view(), name="position-list"),
     path(
         "positions/create/", PositionFormatCreateView.as_view(), name="position-create"
     ),
-    path("positions/<int:pk>", PositionDetailView.as_view(), name="position-detail"),
+    path(
+        "positions/<int:pk>", AsyncPositionDetailView.as_view(), name="position-detail"
+    ),
     path(
         "positions/<int:pk>/delete/",
         PositionFormatDeleteView.as_view(),
         name="position-delete",
     ),
-    path("task-types/", TaskTypeListView.as_view(), name="task-type-list"),
+    path("task-types/", AsyncTaskTypeListView.as_view(), name="task-type-list"),
     path(
         "task-types/create/",
         TaskTypeFormatCreateView.as_view(),
         name="task-type-create",
     ),
-    path("task-types/<int:pk>", TaskTypeDetailView.as_view(), name="task-type-detail"),
+    path(
+        "task-types/<int:pk>",
+        AsyncTaskTypeDetailView.as_view(),
+        name="task-type-detail",
+    ),
     path(
         "task-types/<int:pk>/delete/",
         TaskTypeFormatDeleteView.as_view(),
         name="task-type-delete",
     ),
-    path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/", AsyncTaskListView.as_view(), name="task-list"),
     path("tasks/create/", TaskFormatCreateView.as_view(), name="task-create"),
-    path("tasks/<int:pk>", TaskDetailView.as_view(), name="task-detail"),
+    path("tasks/<int:pk>", AsyncTaskDetailView.as_view(), name="task-detail"),
     path("tasks/<int:pk>/update/", TaskFormatUpdateView.as_view(), name="task-update"),
     path("tasks/<int:pk>/delete/", TaskFormatDeleteView.as_view(), name="task-delete"),
-    path("workers/", WorkerListView.as_view(), name="worker-list"),
-    path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
+    path("workers/", AsyncWorkerListView.as_view(), name="worker-list"),
+    path("workers/<int:pk>/", AsyncWorkerDetailView.as_view(), name="worker-detail"),
+    path(
+        "workers/<int:pk>/tasks/",
+        WorkerTaskHistoryView.as_view(),
+        name="worker-task-history",
+    ),
     path("workers/<int:pk>/avatar/", upload_avatar, name="avatar-upload"),
     path("workers/create/", WorkerFormatCreateView.as_view(), name="worker-create"),
     path(
@@ -75,8 +93,28 @@ urlpatterns = [
         AssignOrRemoveWorkerView.as_view(),
         name="worker-assign-remove",
     ),
-    path("tasks/<int:pk>/comments/", CommentListView.as_view(), name="comment-list"),
+    path("tasks/assignments/", AssignmentsView.as_view(), name="assignments"),
+    path(
+        "workers/autocomplete/",
+        WorkerAutocompleteView.as_view(),
+        name="worker-autocomplete",
+    ),
+    path(
+        "positions/autocomplete/",
+        PositionAutocompleteView.as_view(),
+        name="position-autocomplete",
+    ),
+    path(
+        "tasks/<int:pk>/comments/", AsyncCommentListView.as_view(), name="comment-list"
+    ),
+    path(
+        "tasks/<int:pk>/comments/since/",
+        AsyncCommentsSinceView.as_view(),
+        name="comment-since",
+    ),
+    path("tasks/<int:pk>/events/", TaskEventsView.as_view(), name="task-events"),
     path("comment/delete/<int:pk>/", delete_comment, name="comment-delete"),
+    path("metrics/", metrics, name="metrics"),
     path("accounts/login/", CustomLoginView.as_view(), name="login"),
 ]
 
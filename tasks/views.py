@@ -1,15 +1,40 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
-from django.db.models import Count
-from django.http import HttpRequest, HttpResponse
+from django.db import IntegrityError
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    OuterRef,
+    Q,
+    Value,
+)
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.http import HttpResponseForbidden
-from django.shortcuts import render, redirect, get_object_or_404
-from django.urls import reverse_lazy
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, cached_property
 from django.views import generic
 
+from tasks import assignments, list_cache, live
 from tasks.forms import (
     WorkerCreateForm,
     CommentaryForm,
@@ -17,6 +42,7 @@ from tasks.forms import (
     WorkerUpdateForm,
     WorkerSearchForm,
     TaskTypeSearchForm,
+    TaskFilterForm,
     TaskSearchForm,
     PositionSearchForm,
     TaskCreateForm,
@@ -24,18 +50,33 @@ from tasks.forms import (
     PositionCreateForm,
     CustomAuthenticationForm,
 )
-from tasks.models import Position, TaskType, Task, Worker, Commentary
+from tasks.list_cache import CachedListMixin, assignees_version
+from tasks.metrics import exposition, get_registry
+from tasks.mixins import AsyncDetailMixin, AsyncListMixin, AsyncLoginRequiredMixin
+from tasks.models import ArchivedTask, Position, TaskType, Task, Worker, Commentary
+from tasks.pagination import (
+    EstimatedCountPaginator,
+    InvalidCursor,
+    KeysetPaginationMixin,
+    KeysetPaginator,
+    KeysetSubListMixin,
+)
+from tasks.search import search_contains, search_tasks_full_text
 
 
 def index(request: HttpRequest) -> HttpResponse:
     return render(request, "tasks/welcome.html")
 
 
-class PositionListView(LoginRequiredMixin, generic.ListView):
+class PositionListView(
+    LoginRequiredMixin, CachedListMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Position
     template_name = "tasks/position_list.html"
     paginate_by = 5
-    queryset = Position.objects.annotate(worker_count=Count("workers")).order_by("name")
+    keyset_ordering = ("name", "id")
+    cache_models = (Worker,)
+    queryset = Position.objects.order_by("name")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(PositionListView, self).get_context_data(**kwargs)
@@ -46,7 +87,7 @@ class PositionListView(LoginRequiredMixin, generic.ListView):
     def get_queryset(self):
         form = PositionSearchForm(self.request.GET)
         if form.is_valid():
-            return self.queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search_contains(self.queryset, "name", form.cleaned_data["name"])
         return self.queryset
 
 
@@ -62,9 +103,20 @@ class PositionFormatCreateView(LoginRequiredMixin, generic.CreateView):
         return context
 
 
-class PositionDetailView(LoginRequiredMixin, generic.DetailView):
+class PositionDetailView(LoginRequiredMixin, KeysetSubListMixin, generic.DetailView):
     model = Position
     template_name = "tasks/position_detail.html"
+    paginate_by = 12
+    sublist_related_name = "workers"
+    sublist_ordering = ("username", "id")
+
+    def get_sublist_queryset(self):
+        return (
+            super()
+            .get_sublist_queryset()
+            .select_related("position")
+            .only("username", "avatar", "avatar_variants", "position__name")
+        )
 
 
 class PositionFormatDeleteView(LoginRequiredMixin, generic.DeleteView):
@@ -73,12 +125,16 @@ class PositionFormatDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("tasks:position-list")
 
 
-class TaskTypeListView(LoginRequiredMixin, generic.ListView):
+class TaskTypeListView(
+    LoginRequiredMixin, CachedListMixin, KeysetPaginationMixin, generic.ListView
+):
     model = TaskType
     template_name = "tasks/task_type_list.html"
     context_object_name = "task_type_list"
     paginate_by = 5
-    queryset = TaskType.objects.annotate(tasks_count=Count("tasks")).order_by("name")
+    keyset_ordering = ("name", "id")
+    cache_models = (Task,)
+    queryset = TaskType.objects.order_by("name")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(TaskTypeListView, self).get_context_data(**kwargs)
@@ -89,7 +145,7 @@ class TaskTypeListView(LoginRequiredMixin, generic.ListView):
     def get_queryset(self):
         form = TaskTypeSearchForm(self.request.GET)
         if form.is_valid():
-            return self.queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search_contains(self.queryset, "name", form.cleaned_data["name"])
         return self.queryset
 
 
@@ -105,11 +161,29 @@ class TaskTypeFormatCreateView(LoginRequiredMixin, generic.CreateView):
         return context
 
 
-class TaskTypeDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskTypeDetailView(LoginRequiredMixin, KeysetSubListMixin, generic.DetailView):
     model = TaskType
     template_name = "tasks/task_type_detail.html"
     context_object_name = "task_type"
     paginate_by = 5
+    sublist_related_name = "tasks"
+    sublist_ordering = ("name", "-deadline", "id")
+
+    @cached_property
+    def filter_form(self):
+        return TaskFilterForm(self.request.GET)
+
+    def get_sublist_queryset(self):
+        return self.filter_form.filter(
+            super()
+            .get_sublist_queryset()
+            .only("name", "deadline", "is_completed", "priority", "task_type")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["filter_form"] = self.filter_form
+        return context
 
 
 class TaskTypeFormatDeleteView(LoginRequiredMixin, generic.DeleteView):
@@ -118,23 +192,64 @@ class TaskTypeFormatDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("tasks:task-type-list")
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+class TaskListView(
+    LoginRequiredMixin, CachedListMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Task
     template_name = "tasks/task_list.html"
     paginate_by = 5
-    queryset = Task.objects.all()
+    paginator_class = EstimatedCountPaginator
+    keyset_ordering = ("name", "-deadline", "id")
+    queryset = Task.objects.only("name", "deadline", "is_completed", "priority")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(TaskListView, self).get_context_data(**kwargs)
         name = self.request.GET.get("name", "")
-        context["search_form"] = TaskSearchForm(initial={"name": name})
+        full_text = bool(self.request.GET.get("full_text"))
+        context["search_form"] = TaskSearchForm(
+            initial={
+                "name": name,
+                "full_text": full_text,
+                "archived": self.include_archived(),
+            }
+        )
         return context
 
-    def get_queryset(self):
+    def include_archived(self):
+        return bool(self.request.GET.get("archived"))
+
+    def get_keyset_ordering(self):
+        # Ranked full-text results are ordered by relevance, not by the keyset,
+        # and the archive union is paged by OFFSET.
+        if self.request.GET.get("full_text") and self.request.GET.get("name"):
+            return None
+        if self.include_archived():
+            return None
+        return super().get_keyset_ordering()
+
+    def search(self, queryset):
         form = TaskSearchForm(self.request.GET)
         if form.is_valid():
-            return self.queryset.filter(name__icontains=form.cleaned_data["name"])
-        return self.queryset
+            if form.cleaned_data["full_text"]:
+                return search_tasks_full_text(queryset, form.cleaned_data["name"])
+            return search_contains(queryset, "name", form.cleaned_data["name"])
+        return queryset
+
+    def get_queryset(self):
+        queryset = self.search(self.queryset)
+        if not self.include_archived():
+            return queryset
+        fields = ("id", "name", "deadline", "is_completed", "priority")
+        archived = self.search(ArchivedTask.objects.all())
+        return (
+            queryset.order_by()
+            .values(*fields, is_archived=Value(False))
+            .union(
+                archived.order_by().values(*fields, is_archived=Value(True)),
+                all=True,
+            )
+            .order_by("name", "-deadline", "id")
+        )
 
 
 class TaskFormatCreateView(LoginRequiredMixin, generic.CreateView):
@@ -152,8 +267,48 @@ class TaskFormatCreateView(LoginRequiredMixin, generic.CreateView):
 class TaskDetailView(LoginRequiredMixin, generic.DetailView):
     model = Task
     template_name = "tasks/task_detail.html"
-    paginate_by = 5
-    queryset = Task.objects.prefetch_related("assignees")
+    assignees_per_page = 20
+    assignees_cursor_kwarg = "assignees_cursor"
+
+    def get_queryset(self):
+        membership = Task.assignees.through.objects.filter(
+            task=OuterRef("pk"), worker=self.request.user.pk
+        )
+        return Task.objects.select_related("task_type").annotate(
+            is_assigned_to_me=Exists(membership)
+        )
+
+    def get_assignee_paginator(self):
+        return KeysetPaginator(
+            self.object.assignees.select_related("position").only(
+                "username", "avatar", "avatar_variants", "position__name"
+            ),
+            self.assignees_per_page,
+            ("username", "id"),
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = self.get_assignee_paginator()
+        cursor = self.request.GET.get(self.assignees_cursor_kwarg, "")
+        if cursor:
+            # Checked before rendering, so no fragment is cached under it.
+            try:
+                paginator.cursor_values(cursor)
+            except InvalidCursor:
+                raise Http404("Invalid cursor.")
+        # Only evaluated when the cached assignee grid has to be rebuilt.
+        context["assignee_page"] = SimpleLazyObject(
+            lambda: paginator.page(cursor or None)
+        )
+        context["assignees_cursor"] = cursor
+        if list_cache.enabled():
+            context["assignees_version"] = assignees_version(self.object.pk)
+            context["assignees_cache_timeout"] = 3600
+        else:
+            # A zero timeout renders the grid without keeping it.
+            context["assignees_cache_timeout"] = 0
+        return context
 
 
 class TaskFormatUpdateView(LoginRequiredMixin, generic.UpdateView):
@@ -176,11 +331,17 @@ class TaskFormatDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("tasks:task-list")
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+class WorkerListView(
+    LoginRequiredMixin, CachedListMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Worker
     template_name = "tasks/worker_list.html"
     paginate_by = 8
-    queryset = Worker.objects.select_related("position")
+    keyset_ordering = ("username", "id")
+    cache_models = (Position,)
+    queryset = Worker.objects.select_related("position").only(
+        "username", "avatar", "avatar_variants", "position__name"
+    )
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(WorkerListView, self).get_context_data(**kwargs)
@@ -191,15 +352,133 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
     def get_queryset(self):
         form = WorkerSearchForm(self.request.GET)
         if form.is_valid():
-            return self.queryset.filter(
-                username__icontains=form.cleaned_data["username"]
+            return search_contains(
+                self.queryset, "username", form.cleaned_data["username"]
             )
         return self.queryset
 
 
-class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
+class WorkerTaskHistoryMixin:
+    task_statuses = {
+        "open": (Q(is_completed=False), ("deadline", "id")),
+        "completed": (Q(is_completed=True), ("-deadline", "id")),
+    }
+    tasks_per_page = 10
+
+    def get_task_status(self):
+        status = self.request.GET.get("status")
+        return status if status in self.task_statuses else "open"
+
+    def get_task_page(self, worker_pk):
+        condition, ordering = self.task_statuses[self.get_task_status()]
+        tasks = (
+            Task.objects.filter(condition, assignees=worker_pk)
+            .only("name", "deadline", "is_completed", "priority")
+            .annotate(
+                is_overdue=ExpressionWrapper(
+                    Q(is_completed=False, deadline__lt=timezone.now()),
+                    output_field=BooleanField(),
+                )
+            )
+        )
+        paginator = KeysetPaginator(tasks, self.tasks_per_page, ordering)
+        try:
+            return paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+
+
+class WorkerDetailView(LoginRequiredMixin, WorkerTaskHistoryMixin, generic.DetailView):
     model = Worker
     template_name = "tasks/worker_detail.html"
+    queryset = Worker.objects.select_related("position")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        now = timezone.now()
+        context["task_counts"] = Task.objects.filter(
+            assignees=self.object.pk
+        ).aggregate(
+            open=Count("pk", filter=Q(is_completed=False, deadline__gte=now)),
+            overdue=Count("pk", filter=Q(is_completed=False, deadline__lt=now)),
+            completed=Count("pk", filter=Q(is_completed=True)),
+        )
+        context["task_status"] = self.get_task_status()
+        page = self.get_task_page(self.object.pk)
+        # Drives includes/pagination.html like a paginated list view.
+        context["page_obj"] = page
+        context["is_paginated"] = page.has_other_pages()
+        return context
+
+
+class WorkerTaskHistoryView(LoginRequiredMixin, WorkerTaskHistoryMixin, generic.View):
+    """One page of a worker's tasks as JSON, for infinite scroll."""
+
+    def get(self, request, pk):
+        get_object_or_404(Worker.objects.only("pk"), pk=pk)
+        page = self.get_task_page(pk)
+        return JsonResponse(
+            {
+                "status": self.get_task_status(),
+                "results": [
+                    {
+                        "id": task.pk,
+                        "name": task.name,
+                        "priority": task.priority,
+                        "deadline": task.deadline.isoformat(),
+                        "is_completed": task.is_completed,
+                        "is_overdue": task.is_overdue,
+                        "url": reverse("tasks:task-detail", kwargs={"pk": task.pk}),
+                    }
+                    for task in page
+                ],
+                "next_cursor": page.next_cursor,
+            }
+        )
+
+
+class AutocompleteView(generic.View):
+    """
+    JSON search over ``search_field`` for the autocomplete widgets. Matching
+    uses search_contains(), which the trigram indexes from migration 0009
+    serve, and never returns more than ``limit`` rows.
+    """
+
+    model = None
+    search_field = "name"
+    limit = 20
+
+    def get_queryset(self):
+        return self.model.objects.order_by(self.search_field, "id")
+
+    def get(self, request):
+        queryset = search_contains(
+            self.get_queryset(), self.search_field, request.GET.get("q")
+        )
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": obj.pk, "text": str(obj)} for obj in queryset[: self.limit]
+                ]
+            }
+        )
+
+
+class WorkerAutocompleteView(LoginRequiredMixin, AutocompleteView):
+    model = Worker
+    search_field = "username"
+
+    def get_queryset(self):
+        queryset = super().get_queryset().only("username")
+        position = self.request.GET.get("position")
+        if position and position.isdigit():
+            queryset = queryset.filter(position_id=position)
+        return queryset
+
+
+class PositionAutocompleteView(AutocompleteView):
+    # Public: the sign-up form picks a position before there is a user.
+    model = Position
 
 
 class WorkerFormatCreateView(generic.CreateView):
@@ -254,43 +533,303 @@ def upload_avatar(request: HttpRequest, pk: int) -> HttpResponse:
 
 class AssignOrRemoveWorkerView(LoginRequiredMixin, generic.View):
     def post(self, request, pk):
-        task = Task.objects.get(pk=pk)
-        user = request.user
-        if task.assignees.filter(pk=user.pk).exists():
-            task.assignees.remove(user)
-        else:
-            task.assignees.add(user)
+        action = request.POST.get("action")
+        if action not in ("assign", "unassign"):
+            return HttpResponseBadRequest("Expected action=assign or action=unassign.")
+        try:
+            assignments.apply(**{action: [(pk, request.user.pk)]})
+        except assignments.InvalidAssignment:
+            raise Http404("No such task.")
         return redirect("tasks:task-detail", pk=pk)
 
 
-class CommentListView(LoginRequiredMixin, generic.ListView):
+class AssignmentsView(LoginRequiredMixin, generic.View):
+    """
+    Batch assign/unassign endpoint. Takes a JSON body such as
+    ``{"assign": [{"task": 1, "worker": 2}], "unassign": [{"task": 3}]}``
+    and returns the resulting assignee ids of every task it touched.
+    Non-staff users may only change their own assignments.
+    """
+
+    max_pairs = 500
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+            if not isinstance(payload, dict):
+                raise ValueError
+        except ValueError:
+            return JsonResponse({"error": "Expected a JSON object."}, status=400)
+        try:
+            pairs = {
+                action: assignments.parse_pairs(
+                    payload.get(action, []), request.user.pk
+                )
+                for action in ("assign", "unassign")
+            }
+        except assignments.InvalidAssignment as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        if sum(map(len, pairs.values())) > self.max_pairs:
+            return JsonResponse(
+                {"error": f"At most {self.max_pairs} assignments per request."},
+                status=400,
+            )
+        if not request.user.is_staff and any(
+            worker_id != request.user.pk
+            for action_pairs in pairs.values()
+            for _, worker_id in action_pairs
+        ):
+            return JsonResponse(
+                {"error": "You can only change your own assignments."}, status=403
+            )
+
+        try:
+            assignees = assignments.apply(**pairs)
+        except assignments.InvalidAssignment as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        except IntegrityError:
+            # A task or worker was deleted after it was checked.
+            return JsonResponse({"error": "Please retry."}, status=409)
+        return JsonResponse(
+            {"tasks": {str(task_id): ids for task_id, ids in assignees.items()}}
+        )
+
+
+class CommentListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = Commentary
     template_name = "tasks/comment_list.html"
     paginate_by = 5
+    paginator_class = EstimatedCountPaginator
+    keyset_ordering = ("-created_time", "-id")
 
     def get_queryset(self):
-        return Commentary.objects.filter(task_id=self.kwargs["pk"]).order_by(
-            "-created_time"
+        return (
+            Commentary.objects.filter(task_id=self.kwargs["pk"])
+            .select_related("user")
+            .order_by("-created_time")
         )
 
+    def get_task(self):
+        return get_object_or_404(Task, pk=self.kwargs["pk"])
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["comment_form"] = CommentaryForm()
-        context["task"] = get_object_or_404(
-            Task.objects.annotate(comment_count=Count("commentaries")),
-            pk=self.kwargs["pk"],
-        )
+        context["task"] = self.get_task()
+        page = context["page_obj"]
+        # Only the newest page follows new comments; it starts with the newest.
+        if not page.has_previous():
+            context["follow_new_comments"] = True
+            context["since_cursor"] = (
+                comments_since_cursor(page[0]) if len(page) else ""
+            )
         return context
 
+    def created_response(self, comment):
+        # Scripted posts get just the new comment back, not the whole thread.
+        if self.request.headers.get("X-Requested-With") == "XMLHttpRequest":
+            return render(
+                self.request, "includes/comment.html", {"comment": comment}, status=201
+            )
+        return redirect("tasks:comment-list", pk=comment.task_id)
+
     def post(self, request, *args, **kwargs):
         task = get_object_or_404(Task, pk=self.kwargs["pk"])
         form = CommentaryForm(request.POST)
-        if form.is_valid():
-            new_comment = form.save(commit=False)
-            new_comment.user = self.request.user
-            new_comment.task = task
-            new_comment.save()
-        return redirect("tasks:comment-list", pk=task.pk)
+        if not form.is_valid():
+            return redirect("tasks:comment-list", pk=task.pk)
+        new_comment = form.save(commit=False)
+        new_comment.user = self.request.user
+        new_comment.task = task
+        new_comment.save()
+        return self.created_response(new_comment)
+
+
+SINCE_ORDERING = ("created_time", "id")
+
+
+def comments_since_cursor(comment):
+    return KeysetPaginator(Commentary.objects.none(), 1, SINCE_ORDERING).cursor_for(
+        comment
+    )
+
+
+class CommentsSinceView(LoginRequiredMixin, generic.View):
+    """
+    Comments of a task posted after ``?cursor=``, oldest first, as JSON with
+    their rendered fragments. The returned cursor is the one to poll with next.
+
+    ``created_time`` is stamped before the row commits, so a comment can show
+    up after a later one has moved the cursor past it. Each response also
+    repeats the comments of the ``overlap`` before the cursor; clients skip
+    the ids they already have.
+    """
+
+    limit = 50
+    overlap = timedelta(seconds=10)
+
+    def get_paginator(self):
+        return KeysetPaginator(
+            Commentary.objects.filter(task_id=self.kwargs["pk"]).select_related("user"),
+            self.limit,
+            SINCE_ORDERING,
+        )
+
+    def get_overlap_queryset(self, paginator, cursor):
+        if not cursor:
+            return paginator.queryset.none()
+        (created_time, _), _ = paginator.cursor_values(cursor)
+        return paginator.queryset.filter(
+            created_time__gte=created_time - self.overlap,
+            created_time__lte=created_time,
+        ).order_by(*SINCE_ORDERING)[: self.limit]
+
+    def get(self, request, pk):
+        cursor = request.GET.get("cursor") or None
+        paginator = self.get_paginator()
+        try:
+            overlap = list(self.get_overlap_queryset(paginator, cursor))
+            page = paginator.page(cursor)
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return self.render_comments(paginator, page, overlap, cursor)
+
+    def render_comments(self, paginator, page, overlap, cursor):
+        fresh = page.object_list
+        ids = {comment.pk for comment in fresh}
+        comments = [comment for comment in overlap if comment.pk not in ids] + fresh
+        return JsonResponse(
+            {
+                "comments": [
+                    {
+                        "id": comment.pk,
+                        "user": comment.user.username,
+                        "content": comment.content,
+                        "created_time": comment.created_time.isoformat(),
+                    }
+                    for comment in comments
+                ],
+                "html": "".join(
+                    render_to_string(
+                        "includes/comment.html", {"comment": comment}, self.request
+                    )
+                    for comment in comments
+                ),
+                "cursor": paginator.cursor_for(fresh[-1]) if fresh else cursor,
+                "has_more": page.has_next(),
+            }
+        )
+
+
+class AsyncCommentsSinceView(AsyncLoginRequiredMixin, CommentsSinceView):
+    async def get(self, request, pk):
+        cursor = request.GET.get("cursor") or None
+        paginator = self.get_paginator()
+        try:
+            overlap = [
+                comment
+                async for comment in self.get_overlap_queryset(paginator, cursor)
+            ]
+            page = await paginator.apage(cursor)
+        except InvalidCursor:
+            raise Http404("Invalid cursor.")
+        return self.render_comments(paginator, page, overlap, cursor)
+
+
+class TaskEventsView(AsyncLoginRequiredMixin, generic.View):
+    """
+    Server-sent events for one task: ``comment.created``, ``comment.deleted``
+    and ``assignees.changed`` as they are committed, with a comment line every
+    ``heartbeat`` seconds so idle proxies keep the connection open. A ``reset``
+    event means the listener fell behind and should reload.
+    """
+
+    heartbeat = 15
+    retry = 5000
+
+    async def get(self, request, pk):
+        if not await Task.objects.filter(pk=pk).aexists():
+            raise Http404("No task found.")
+        response = StreamingHttpResponse(
+            self.stream(live.get_hub().subscribe(pk)),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, subscription):
+        try:
+            yield f"retry: {self.retry}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                data = json.dumps(event.get("data", {}))
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+
+class AsyncPositionListView(AsyncLoginRequiredMixin, AsyncListMixin, PositionListView):
+    pass
+
+
+class AsyncPositionDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, PositionDetailView
+):
+    pass
+
+
+class AsyncTaskTypeListView(AsyncLoginRequiredMixin, AsyncListMixin, TaskTypeListView):
+    pass
+
+
+class AsyncTaskTypeDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, TaskTypeDetailView
+):
+    pass
+
+
+class AsyncTaskListView(AsyncLoginRequiredMixin, AsyncListMixin, TaskListView):
+    pass
+
+
+class AsyncTaskDetailView(AsyncLoginRequiredMixin, AsyncDetailMixin, TaskDetailView):
+    pass
+
+
+class AsyncWorkerListView(AsyncLoginRequiredMixin, AsyncListMixin, WorkerListView):
+    pass
+
+
+class AsyncWorkerDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, WorkerDetailView
+):
+    pass
+
+
+class AsyncCommentListView(AsyncLoginRequiredMixin, AsyncListMixin, CommentListView):
+    async def get(self, request, *args, **kwargs):
+        self.task = await aget_object_or_404(Task, pk=self.kwargs["pk"])
+        return await super().get(request, *args, **kwargs)
+
+    def get_task(self):
+        return self.task
+
+    async def post(self, request, *args, **kwargs):
+        task = await aget_object_or_404(Task, pk=self.kwargs["pk"])
+        form = CommentaryForm(request.POST)
+        if not form.is_valid():
+            return redirect("tasks:comment-list", pk=task.pk)
+        new_comment = form.save(commit=False)
+        new_comment.user = request.user
+        new_comment.task = task
+        await new_comment.asave()
+        return self.created_response(new_comment)
 
 
 @login_required
@@ -312,3 +851,16 @@ class CustomLoginView(LoginView):
         else:
             self.request.session.set_expiry(0)
         return super().form_valid(form)
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Request metrics of every worker process, for Prometheus to scrape."""
+    if (
+        request.META.get("REMOTE_ADDR") not in settings.INTERNAL_IPS
+        and not request.user.is_superuser
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        exposition(get_registry().collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,47 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """
+    Select widget that renders only the currently selected options. The
+    rest are fetched from ``url`` as the user types (static/js/autocomplete.js),
+    so the page no longer grows with the size of the choice queryset.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    class Media:
+        js = ("js/autocomplete.js",)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {str(v) for v in value if str(v).isdigit()}
+        options = []
+        if not self.allow_multiple_selected:
+            options.append(self.create_option(name, "", "---------", not selected, 0))
+        if selected:
+            # One IN query for just the selected rows.
+            queryset = self.choices.queryset.filter(pk__in=selected)
+            for obj in queryset:
+                option_value, label = self.choices.choice(obj)
+                options.append(
+                    self.create_option(
+                        name, option_value, label, True, len(options), attrs=attrs
+                    )
+                )
+        return [(None, [option], option["index"]) for option in options]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass